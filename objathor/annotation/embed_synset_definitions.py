@@ -1,13 +1,27 @@
+import json
 import os
 import random
 import urllib.request
-from typing import Dict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import compress_pickle
 import numpy as np
 from tqdm import tqdm
 
-from objathor.utils.gpt_utils import get_embedding, get_embeddings_from_texts
+from objathor.utils.gpt_utils import get_embeddings_batches_concurrently
 from objathor.utils.synsets import (
     all_synsets,
     synset_definitions,
@@ -16,12 +30,211 @@ from objathor.utils.synsets import (
     synset_hypernyms,
 )
 
+from nltk.corpus import wordnet2022 as wn
+from nltk.corpus.reader.wordnet import Synset
+
 OBJATHOR_DATA_DIR = os.path.join(os.path.expanduser("~"), ".objathor_data")
 
 SYNSET_DEFINITION_EMB_FILE = os.path.join(
     OBJATHOR_DATA_DIR, "synset_definition_embeddings_with_lemmas__2024-01-22.pkl.gz"
 )
 
+EMBEDDING_BATCH_SIZE = 256
+
+# Embeddings are unit-normalized and only used for cosine similarity / nearest-neighbor
+# ranking, where float16's ~3 significant digits are plenty. Storing them as float16
+# halves disk usage and load time; they are cast back to float32 when used.
+EMBEDDING_DISK_DTYPE = np.float16
+
+
+def _normalized_rows(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+    mat = np.asarray(embeddings, dtype=np.float32)
+    np.divide(mat, np.linalg.norm(mat, axis=1, keepdims=True), out=mat)
+    return mat
+
+
+def _atomic_dump(fname: str, dump: Callable[[IO], None], mode: str = "w"):
+    tmp_fname = f"{fname}.tmp"
+    with open(tmp_fname, mode) as f:
+        dump(f)
+    os.replace(tmp_fname, fname)
+
+
+def _load_jsonl_texts(fname: str) -> Dict[str, str]:
+    key_to_text = {}
+    if os.path.isfile(fname):
+        with open(fname, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partially written line from an interrupted run, will be re-embedded
+                    continue
+                key_to_text[entry["key"]] = entry["text"]
+    return key_to_text
+
+
+def _create_rows_memmap(fname: str, keys: Sequence[str], dim: int) -> np.memmap:
+    # The keys are written first so that a rows file never exists without them
+    _atomic_dump(f"{fname}.keys.json", lambda f: json.dump(list(keys), f))
+    return np.memmap(
+        f"{fname}.embs.f16",
+        dtype=EMBEDDING_DISK_DTYPE,
+        mode="w+",
+        shape=(len(keys), dim),
+    )
+
+
+def _open_rows_memmap(fname: str, keys: Sequence[str]) -> Optional[np.memmap]:
+    embs_path = f"{fname}.embs.f16"
+    keys_path = f"{fname}.keys.json"
+    if not os.path.isfile(embs_path):
+        return None
+
+    assert os.path.isfile(keys_path), f"Missing {keys_path} for {embs_path}."
+    with open(keys_path, "r") as f:
+        saved_keys = json.load(f)
+    assert saved_keys == list(keys), (
+        f"The rows of {embs_path} were saved for different keys than the current ones"
+        f" (e.g. after a wordnet update), delete {fname}.* to recompute them."
+    )
+
+    num_bytes = os.path.getsize(embs_path)
+    itemsize = np.dtype(EMBEDDING_DISK_DTYPE).itemsize
+    dim, remainder = divmod(num_bytes, len(keys) * itemsize)
+    assert dim > 0 and remainder == 0, (
+        f"{embs_path} has {num_bytes} bytes, which is not a whole number of"
+        f" {len(keys)} rows of {EMBEDDING_DISK_DTYPE.__name__} embeddings."
+    )
+    return np.memmap(
+        embs_path, dtype=EMBEDDING_DISK_DTYPE, mode="r+", shape=(len(keys), dim)
+    )
+
+
+@lru_cache(maxsize=None)
+def _lemmas_of(synset_str: str) -> List[str]:
+    return synset_lemmas([synset_str])[0]
+
+
+@lru_cache(maxsize=None)
+def _hypers_of(synset_str: str) -> List[Synset]:
+    return synset_hypernyms([synset_str])[0]
+
+
+@lru_cache(maxsize=None)
+def _hypos_of(synset_str: str) -> List[Synset]:
+    return synset_hyponyms([synset_str])[0]
+
+
+@dataclass(eq=False)
+class EmbeddingStore(Mapping[str, np.ndarray]):
+    """
+    Embeddings stored as the rows of a single (N, D) matrix, with `key_list[i]` (and
+    optionally `texts[i]`) describing row `i`. Rows past `len(key_list)` are spare capacity.
+    The matrix is float16 when loaded from disk, rows are returned as float32.
+
+    The store is a read-only mapping from key to embedding so it can be used wherever the
+    `Dict[str, np.ndarray]` previously returned by `get_embeddings` & co. was.
+    """
+
+    key_list: List[str] = field(default_factory=list)
+    embs: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32))
+    texts: Optional[List[str]] = None
+    key_to_idx: Dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        self.key_to_idx = {key: idx for idx, key in enumerate(self.key_list)}
+
+    def __len__(self) -> int:
+        return len(self.key_list)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.key_list)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.key_to_idx
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.embs[self.key_to_idx[key]].astype(np.float32)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.embs[: len(self.key_list)]
+
+    def rows(self, keys: Sequence[str]) -> np.ndarray:
+        idxs = np.fromiter(
+            (self.key_to_idx[key] for key in keys), dtype=np.int64, count=len(keys)
+        )
+        return self.embs[idxs].astype(np.float32)
+
+    def extend(
+        self,
+        keys: Sequence[str],
+        embs: np.ndarray,
+        texts: Optional[Sequence[str]] = None,
+    ):
+        start = len(self.key_list)
+        end = start + len(keys)
+        if start == 0:
+            self.embs = np.empty((max(end, 1024), embs.shape[1]), dtype=np.float32)
+        elif end > self.embs.shape[0]:
+            grown = np.empty(
+                (max(end, 2 * self.embs.shape[0]), self.embs.shape[1]), dtype=np.float32
+            )
+            grown[:start] = self.embs[:start]
+            self.embs = grown
+
+        self.embs[start:end] = embs
+        self.key_to_idx.update({key: idx for idx, key in enumerate(keys, start)})
+        self.key_list.extend(keys)
+        if self.texts is not None:
+            assert texts is not None, "This store keeps texts, `texts` must be given."
+            self.texts.extend(texts)
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        return dict(zip(self.key_list, self.matrix.astype(np.float32)))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, np.ndarray]) -> "EmbeddingStore":
+        keys = list(data.keys())
+        return cls(
+            key_list=keys,
+            embs=np.stack([data[key] for key in keys]).astype(np.float32, copy=False),
+        )
+
+    @staticmethod
+    def exists(base: str) -> bool:
+        return os.path.isfile(f"{base}.embs.npy") and os.path.isfile(
+            f"{base}.keys.json"
+        )
+
+    def save(self, base: str):
+        # Rows/texts beyond `len(key_list)` are ignored when loading, so writing the keys
+        # last keeps the saved store consistent if we crash part way through.
+        _atomic_dump(
+            f"{base}.embs.npy",
+            lambda f: np.save(f, self.matrix.astype(EMBEDDING_DISK_DTYPE)),
+            mode="wb",
+        )
+        if self.texts is not None:
+            _atomic_dump(f"{base}.texts.json", lambda f: json.dump(self.texts, f))
+        _atomic_dump(f"{base}.keys.json", lambda f: json.dump(self.key_list, f))
+
+    @classmethod
+    def load(cls, base: str) -> "EmbeddingStore":
+        """Loads a store saved with `save`, memory-mapping the embeddings matrix."""
+        with open(f"{base}.keys.json", "r") as f:
+            keys = json.load(f)
+
+        texts = None
+        if os.path.isfile(f"{base}.texts.json"):
+            with open(f"{base}.texts.json", "r") as f:
+                texts = json.load(f)[: len(keys)]
+
+        return cls(
+            key_list=keys, embs=np.load(f"{base}.embs.npy", mmap_mode="r"), texts=texts
+        )
+
 
 def download_embeddings(
     url: str = "https://prior-datasets.s3.us-east-2.amazonaws.com/vida-synset-embeddings/synset_definition_embeddings_with_lemmas__2024-01-22.pkl.gz",
@@ -45,26 +258,23 @@ def download_embeddings(
 
 
 def get_embeddings(
-    fname: str = os.path.join(OBJATHOR_DATA_DIR, "synset_definition_embeddings.pkl.gz"),
-) -> Dict[str, np.ndarray]:
-    from nltk.corpus import wordnet2022 as wn
-
-    if os.path.isfile(fname):
-        data = compress_pickle.load(fname)
+    fname: str = os.path.join(OBJATHOR_DATA_DIR, "synset_definition_embeddings"),
+) -> EmbeddingStore:
+    if EmbeddingStore.exists(fname):
+        data = EmbeddingStore.load(fname)
+    elif os.path.isfile(f"{fname}.pkl.gz"):
+        # Convert embeddings saved by older versions (a pickled dict) instead of re-embedding
+        data = EmbeddingStore.from_dict(compress_pickle.load(f"{fname}.pkl.gz"))
+        data.save(fname)
     else:
-        data = {}
+        data = EmbeddingStore()
 
     num_additions = 0
     try:
         synsets = []
         texts = []
-        for synset_str in tqdm(all_synsets()):
-            if ".n." not in synset_str:
-                continue
-
-            if synset_str in data:
-                continue
-
+        todo = [s for s in all_synsets() if ".n." in s and s not in data]
+        for synset_str in tqdm(todo):
             synset = wn.synset(synset_str)
             lemmas = synset.lemmas()
             name = lemmas[0].name().replace("_", " ")
@@ -77,87 +287,155 @@ def get_embeddings(
             synsets.append(synset.name())
             texts.append(text)
 
-        embeddings = get_embeddings_from_texts(texts)
-        for synset_str, embedding in zip(synsets, embeddings):
-            data[synset_str] = np.array(embedding) / np.linalg.norm(embedding)
+        text_batches = [
+            texts[start : start + EMBEDDING_BATCH_SIZE]
+            for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+        ]
+        for batch_ind, batch in tqdm(
+            get_embeddings_batches_concurrently(text_batches), total=len(text_batches)
+        ):
+            start = batch_ind * EMBEDDING_BATCH_SIZE
+            data.extend(
+                synsets[start : start + EMBEDDING_BATCH_SIZE], _normalized_rows(batch)
+            )
 
-        num_additions += len(texts)
+            num_additions += len(batch)
+            if num_additions >= 1000:
+                print(f"Saving definition embeddings with {len(data)} entries...")
+                data.save(fname)
+                num_additions = 0
     finally:
         if num_additions > 0:
             print("Saving definition embeddings...")
-            compress_pickle.dump(data, fname)
+            data.save(fname)
 
     return data
 
 
 def get_embeddings_single(
     fname: str = SYNSET_DEFINITION_EMB_FILE,
-) -> Dict[str, np.ndarray]:
-    if not os.path.isfile(fname):
-        try:
-            download_embeddings()
-        except (SystemExit, KeyboardInterrupt):
-            raise
-        except:
-            data = get_embeddings()
-            for key, value in data.items():
-                data[key] = value.astype(np.float32)
-            compress_pickle.dump(data, fname)
-
-    return compress_pickle.load(fname)
-
-
-def local_smoothing(embs: Dict[str, np.ndarray], synset_str: str):
+) -> EmbeddingStore:
+    # The published embeddings are a gzipped pickle, which we convert (once) into a store
+    # that can be memory-mapped on every later call.
+    base = fname[: -len(".pkl.gz")] if fname.endswith(".pkl.gz") else fname
+    if not EmbeddingStore.exists(base):
+        if not os.path.isfile(fname):
+            try:
+                download_embeddings()
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except:
+                data = get_embeddings()
+                compress_pickle.dump(
+                    data.to_dict(), fname, pickler_kwargs={"protocol": 5}
+                )
+
+        EmbeddingStore.from_dict(compress_pickle.load(fname)).save(base)
+
+    return EmbeddingStore.load(base)
+
+
+def get_neighbor_maps(
+    synset_strs: Sequence[str],
+) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Returns maps from each synset to the names of its hyponyms and of its hypernyms."""
+    hypo_map = {s: [h.name() for h in _hypos_of(s)] for s in synset_strs}
+    hyper_map = {s: [h.name() for h in _hypers_of(s)] for s in synset_strs}
+    return hypo_map, hyper_map
+
+
+def local_smoothing(
+    embs: EmbeddingStore,
+    synset_str: str,
+    hypo_map: Dict[str, List[str]],
+    hyper_map: Dict[str, List[str]],
+    verbose: bool = False,
+) -> np.ndarray:
     ref = embs[synset_str]
-    from nltk.corpus import wordnet2022 as wn
 
     comb = [ref]
 
-    hypos = wn.synset(synset_str).hyponyms()
-    print("hypos", [syn.name() for syn in hypos])
+    hypo_names = hypo_map[synset_str]
+    if verbose:
+        print("hypos", hypo_names)
+    hypos = embs.rows(hypo_names)
     if len(hypos) > 0:
-        hypos = np.stack([embs[syn.name()] for syn in hypos], axis=1)
-        hypo_mean = hypos.sum(axis=1)
-        comb.append(0.5 * hypo_mean / np.linalg.norm(hypo_mean))
-
-    hypers = wn.synset(synset_str).hypernyms()
-    print("hypers", [syn.name() for syn in hypers])
+        hypo_mean = hypos.sum(0)
+        hypo_mean /= np.linalg.norm(hypo_mean)
+        comb.append(0.5 * hypo_mean)
+
+    hyper_names = hyper_map[synset_str]
+    if verbose:
+        print("hypers", hyper_names)
+    hypers = embs.rows(hyper_names)
     if len(hypers) > 0:
-        hypers = np.stack([embs[syn.name()] for syn in hypers], axis=1)
-        hyper_mean = hypers.sum(axis=1)
-        comb.append(0.5 * hyper_mean / np.linalg.norm(hyper_mean))
+        hyper_mean = hypers.sum(0)
+        hyper_mean /= np.linalg.norm(hyper_mean)
+        comb.append(0.5 * hyper_mean)
 
     comb = np.sum(comb, axis=0)
     comb = comb / np.linalg.norm(comb)
 
-    if len(hypos) > 0:
-        print("ref, hypos", ref @ hypos, np.mean(ref @ hypos))
+    if verbose:
+        if len(hypos) > 0:
+            print("ref, hypos", hypos @ ref, np.mean(hypos @ ref))
 
-    if len(hypers) > 0:
-        print("ref, hypers", ref @ hypers, np.mean(ref @ hypers))
+        if len(hypers) > 0:
+            print("ref, hypers", hypers @ ref, np.mean(hypers @ ref))
 
-    if len(hypos) > 0 and len(hypers) > 0:
-        print("hypos, hypers", hypos.T @ hypers, np.mean(hypos.T @ hypers))
+        if len(hypos) > 0 and len(hypers) > 0:
+            print("hypos, hypers", hypos @ hypers.T, np.mean(hypos @ hypers.T))
 
-    print("ref, comb", ref @ comb, np.mean(ref @ comb))
+        print("ref, comb", ref @ comb, np.mean(ref @ comb))
 
-    if len(hypos) > 0:
-        print("comb, hypos", comb @ hypos, np.mean(comb @ hypos))
+        if len(hypos) > 0:
+            print("comb, hypos", hypos @ comb, np.mean(hypos @ comb))
 
-    if len(hypers) > 0:
-        print("comb, hypers", comb @ hypers, np.mean(comb @ hypers))
+        if len(hypers) > 0:
+            print("comb, hypers", hypers @ comb, np.mean(hypers @ comb))
+
+    return comb
 
 
 def get_lemmas_definition_embeddings(
     fname: str = os.path.join(
-        OBJATHOR_DATA_DIR, "synset_lemmas_definitions_embeddings.pkl.gz"
+        OBJATHOR_DATA_DIR, "synset_lemmas_definitions_embeddings"
     ),
     max_lemmas: int = 3,
-) -> Dict[str, np.ndarray]:
-    if os.path.isfile(fname):
-        data = compress_pickle.load(fname)
-    else:
-        data = {}
+) -> EmbeddingStore:
+    # Embeddings are written in place to row `key_to_idx[synset_str]` of a memory-mapped
+    # (len(all_synsets()), D) float16 matrix and, once that row is flushed, the synset's
+    # text is appended to a jsonl log. Checkpointing a batch therefore costs O(batch size)
+    # rather than re-saving everything embedded so far. The synset of each row is saved
+    # to `<fname>.keys.json` and checked on reopening.
+    names = all_synsets()
+    key_to_idx = {name: idx for idx, name in enumerate(names)}
+    texts_path = f"{fname}.texts.jsonl"
+
+    old_fname = f"{fname}.pkl.gz"
+    if not os.path.isfile(texts_path) and os.path.isfile(old_fname):
+        # Convert embeddings saved by older versions (a pickled dict of
+        # `dict(emb=..., text=...)` per synset) instead of re-embedding them
+        old_data = {
+            k: v for k, v in compress_pickle.load(old_fname).items() if k in key_to_idx
+        }
+        if len(old_data) > 0:
+            old_keys = list(old_data.keys())
+            old_embs = np.stack([old_data[k]["emb"] for k in old_keys])
+            migrated = _create_rows_memmap(fname, names, old_embs.shape[1])
+            migrated[[key_to_idx[k] for k in old_keys]] = old_embs
+            migrated.flush()
+            del migrated
+            _atomic_dump(
+                texts_path,
+                lambda f: f.writelines(
+                    json.dumps(dict(key=k, text=old_data[k]["text"])) + "\n"
+                    for k in old_keys
+                ),
+            )
+
+    key_to_text = _load_jsonl_texts(texts_path)
+    embs = _open_rows_memmap(fname, names)
 
     def format_lemmas(lemmas):
         lemmas = [f'{lemma.replace("_", " ")}' for lemma in lemmas]
@@ -173,103 +451,104 @@ def get_lemmas_definition_embeddings(
 
         return formatted_lemmas
 
-    num_additions = 0
-    try:
-        for synset_str in tqdm(all_synsets()):
-            if synset_str in data:
-                continue
-
-            lemmas = synset_lemmas([synset_str])[0][:max_lemmas]
-            formatted_lemmas = format_lemmas(lemmas)
-
-            lemmas = set(lemmas)
-
-            hyper = (
-                set(
-                    sum(
-                        [
-                            synset_lemmas([hyp.name()])[0]
-                            for hyp in synset_hypernyms([synset_str])[0]
-                        ],
-                        [],
-                    )
-                )
-                - lemmas
-            )
-            hyper = list(hyper)
-            random.shuffle(hyper)
-            hyper = hyper[:max_lemmas]
-
-            hyper_lemmas = format_lemmas(hyper)
-
-            hyper = set(hyper)
-
-            hypo = (
-                set(
-                    sum(
-                        [
-                            synset_lemmas([hyp.name()])[0]
-                            for hyp in synset_hyponyms([synset_str])[0]
-                        ],
-                        [],
-                    )
+    todo = [s for s in names if s not in key_to_text]
+    def_map = dict(zip(todo, synset_definitions(todo)))
+    hyper_lemmas_map = {
+        n: list(chain.from_iterable(_lemmas_of(h.name()) for h in _hypers_of(n)))
+        for n in todo
+    }
+    hypo_lemmas_map = {
+        n: list(chain.from_iterable(_lemmas_of(h.name()) for h in _hypos_of(n)))
+        for n in todo
+    }
+
+    synsets = []
+    texts = []
+    for synset_str in tqdm(todo):
+        lemmas = _lemmas_of(synset_str)[:max_lemmas]
+        formatted_lemmas = format_lemmas(lemmas)
+
+        lemmas = set(lemmas)
+
+        hyper = set(hyper_lemmas_map[synset_str]) - lemmas
+        hyper = random.sample(tuple(hyper), min(max_lemmas, len(hyper)))
+
+        hyper_lemmas = format_lemmas(hyper)
+
+        hyper = set(hyper)
+
+        hypo = set(hypo_lemmas_map[synset_str]) - lemmas - hyper
+        hypo = random.sample(tuple(hypo), min(max_lemmas, len(hypo)))
+
+        hypo_lemmas = format_lemmas(hypo)
+
+        context = ""
+        if len(hypo_lemmas) > 0 and len(hyper_lemmas) > 0:
+            context = f", a type of {hyper_lemmas} like {hypo_lemmas}"
+        elif len(hyper_lemmas) > 0:
+            context = f", a type of {hyper_lemmas}"
+        elif len(hypo_lemmas) > 0:
+            context = f", like {hypo_lemmas}"
+
+        text = f"{formatted_lemmas}{context}; {def_map[synset_str]}"
+
+        synsets.append(synset_str)
+        texts.append(text)
+
+    text_batches = [
+        texts[start : start + EMBEDDING_BATCH_SIZE]
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+    ]
+    with open(texts_path, "a") as texts_file:
+        for batch_ind, batch in tqdm(
+            get_embeddings_batches_concurrently(text_batches), total=len(text_batches)
+        ):
+            start = batch_ind * EMBEDDING_BATCH_SIZE
+            batch_synsets = synsets[start : start + EMBEDDING_BATCH_SIZE]
+            batch_embs = _normalized_rows(batch)
+            if embs is None:
+                embs = _create_rows_memmap(fname, names, batch_embs.shape[1])
+
+            embs[[key_to_idx[s] for s in batch_synsets]] = batch_embs
+            embs.flush()
+
+            texts_file.write(
+                "".join(
+                    json.dumps(dict(key=synset_str, text=text)) + "\n"
+                    for synset_str, text in zip(batch_synsets, text_batches[batch_ind])
                 )
-                - lemmas
-                - hyper
-            )
-            hypo = list(hypo)
-            random.shuffle(hypo)
-            hypo = hypo[:max_lemmas]
-
-            hypo_lemmas = format_lemmas(hypo)
-
-            context = ""
-            if len(hypo_lemmas) > 0 and len(hyper_lemmas) > 0:
-                context = f", a type of {hyper_lemmas} like {hypo_lemmas}"
-            elif len(hyper_lemmas) > 0:
-                context = f", a type of {hyper_lemmas}"
-            elif len(hypo_lemmas) > 0:
-                context = f", like {hypo_lemmas}"
-
-            text = f"{formatted_lemmas}{context}; {synset_definitions([synset_str])[0]}"
-
-            embedding = get_embedding(text)
-            data[synset_str] = dict(
-                emb=(np.array(embedding) / np.linalg.norm(embedding)).astype(
-                    np.float32
-                ),
-                text=text,
             )
+            texts_file.flush()
+            key_to_text.update(zip(batch_synsets, text_batches[batch_ind]))
 
-            num_additions += 1
-            if num_additions == 1000:
-                print(f"Saving definition embeddings with {len(data)} entries...")
-                compress_pickle.dump(data, fname)
-                num_additions = 0
-    finally:
-        if num_additions > 0:
-            print(f"Saving definition embeddings with {len(data)} entries...")
-            compress_pickle.dump(data, fname)
+    if embs is None:
+        return EmbeddingStore(texts=[])
 
-    return data
+    keys = sorted(
+        (k for k in key_to_text if k in key_to_idx), key=key_to_idx.__getitem__
+    )
+    return EmbeddingStore(
+        key_list=keys,
+        embs=embs if len(keys) == len(names) else embs[[key_to_idx[k] for k in keys]],
+        texts=[key_to_text[key] for key in keys],
+    )
 
 
 if __name__ == "__main__":
     data = get_embeddings()
-    for key, value in data.items():
-        data[key] = value.astype(np.float32)
 
     compress_pickle.dump(
-        data,
+        data.to_dict(),
         os.path.join(
             OBJATHOR_DATA_DIR,
             "synset_definition_embeddings_with_lemmas__2024-01-22.pkl.gz",
         ),
+        pickler_kwargs={"protocol": 5},
     )
 
     # data = get_embeddings()
     # data = get_embeddings_single()
-    # local_smoothing(data, "wardrobe.n.01")
+    # local_smoothing(data, "wardrobe.n.01", *get_neighbor_maps(["wardrobe.n.01"]), verbose=True)
 
     # data = get_lemmas_definition_embeddings()
     print("DONE")
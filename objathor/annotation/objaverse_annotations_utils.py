@@ -4,15 +4,14 @@ from functools import lru_cache
 import prior
 from filelock import FileLock
 
-
-def _lock_for_load():
-    path = os.path.expanduser("~/.prior/objaverse-prior.lock")
-    return FileLock(os.path.expanduser(path))
+# Only acquired on the first (uncached) call of the accessors below, shared so we don't
+# construct a new lock each time.
+_LOAD_LOCK = FileLock(os.path.expanduser("~/.prior/objaverse-prior.lock"))
 
 
 @lru_cache(maxsize=1)
 def get_objaverse_home_annotations():
-    with _lock_for_load():
+    with _LOAD_LOCK:
         return prior.load_dataset(
             "objaverse-plus",
             # revision="ace12898b451c887bb1dd69ede85d32a75a86ef7",  # Human only
@@ -22,7 +21,7 @@ def get_objaverse_home_annotations():
 
 @lru_cache(maxsize=1)
 def get_objaverse_ref_categories():
-    with _lock_for_load():
+    with _LOAD_LOCK:
         annos = prior.load_dataset(
             "objaverse-plus", revision="bce68ddc9f9dfbf1566d61dc4f04ac60e2f2d125"
         )["train"].data
@@ -31,7 +30,7 @@ def get_objaverse_ref_categories():
 
 @lru_cache(maxsize=1)
 def get_objaverse_closest_mapping():
-    with _lock_for_load():
+    with _LOAD_LOCK:
         return prior.load_dataset(
             "objaverse-plus",
             revision="877a5d636a6c437b894d1f8510bc852e49bb1cc0",
@@ -1,6 +1,6 @@
 import os
 import traceback
-from typing import Sequence, Optional, Dict, List, Tuple
+from typing import Sequence, Optional, List, Tuple
 
 import compress_pickle
 import numpy as np
@@ -13,6 +13,7 @@ from nltk.corpus import wordnet2022 as wn
 from sklearn.neighbors import NearestNeighbors
 
 from objathor.annotation.embed_synset_definitions import (
+    EmbeddingStore,
     get_embeddings_single as get_synset_embeddings,
 )
 from objathor.utils.gpt_utils import get_embedding
@@ -21,7 +22,7 @@ DESCRIPTION_EMBEDDING_OUTPUT_DIR = "/tmp/objathor_description_embeddings"
 NUM_NEIGHS = 5
 
 
-_SYNSET_EMBEDDINGS: Optional[Dict[str, np.ndarray]] = None
+_SYNSET_EMBEDDINGS: Optional[EmbeddingStore] = None
 
 
 PICK_SINGLE_SYNSET_TEMPLATE = """\
@@ -88,14 +89,14 @@ _NN: Optional[NearestNeighbors] = None
 def all_embedded_synset() -> List[str]:
     global _KEYS
     if _KEYS is None:
-        _KEYS = sorted(list(synset_embeddings().keys()))
+        _KEYS = list(synset_embeddings().key_list)
     return _KEYS
 
 
 def nearest_neighbor_synsets() -> NearestNeighbors:
     global _NN
     if _NN is None:
-        values = np.stack([synset_embeddings()[key] for key in all_embedded_synset()])
+        values = synset_embeddings().matrix.astype(np.float32)
         print(
             f"NN data shape {values.shape} ({len(all_embedded_synset())} keys), {NUM_NEIGHS} neighbors"
         )
@@ -104,7 +105,9 @@ def nearest_neighbor_synsets() -> NearestNeighbors:
 
 
 def normalize_embedding(emb: Sequence[float]):
-    return (np.array(emb) / np.linalg.norm(emb)).astype(np.float16)
+    arr = np.fromiter(emb, dtype=np.float32, count=len(emb))
+    arr /= np.linalg.norm(arr)
+    return arr.astype(np.float16)
 
 
 def save_embedding(
@@ -114,6 +117,7 @@ def save_embedding(
     compress_pickle.dump(
         normalize_embedding(emb),
         os.path.join(dir, f"description_emb_{uid}.pkl.gz"),
+        pickler_kwargs={"protocol": 5},
     )
 
 
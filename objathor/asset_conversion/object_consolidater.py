@@ -40,6 +40,9 @@ importlib.reload(util)
 FORMAT = "%(asctime)s %(message)s"
 logger = logging.getLogger(__name__)
 
+# Quality used when saving textures directly as JPEGs (see `--texture_format`)
+JPEG_TEXTURE_QUALITY = 90
+
 
 def rotation_matrix(axis: np.ndarray, theta: float) -> np.ndarray:
     """
@@ -508,6 +511,36 @@ def bake_image(
     image.save_render(filepath=TEXTURE_PATH)
 
 
+def save_texture(
+    image: bpy.types.Image, save_path: str, texture_format: str = "png"
+) -> None:
+    """
+    Saves a baked texture, as a JPEG if `texture_format == "jpg"` (in which case any alpha
+    channel is dropped) and otherwise using the scene's (PNG) output settings.
+    """
+    if texture_format != "jpg":
+        image.save_render(filepath=save_path)
+        return
+
+    image_settings = bpy.context.scene.render.image_settings
+    prev_settings = (
+        image_settings.file_format,
+        image_settings.color_mode,
+        image_settings.quality,
+    )
+    try:
+        image_settings.file_format = "JPEG"
+        image_settings.color_mode = "RGB"
+        image_settings.quality = JPEG_TEXTURE_QUALITY
+        image.save_render(filepath=save_path)
+    finally:
+        (
+            image_settings.file_format,
+            image_settings.color_mode,
+            image_settings.quality,
+        ) = prev_settings
+
+
 # GPT generated so doubt it works
 def to_dict(
     asset_name: str,
@@ -611,6 +644,36 @@ def save_json(
         )
 
 
+def save_msgpack(
+    save_path: str,
+    asset_name: str,
+    annotation_dict: Dict[str, Any],
+    visibility_points: Optional[Dict[str, float]] = None,
+    albedo_path: str = None,
+    metallic_smoothness_path: str = None,
+    normal_path: str = None,
+    emission_path: str = None,
+    receptacle: bool = False,
+) -> None:
+    import msgpack
+
+    with open(save_path, "wb") as f:
+        f.write(
+            msgpack.packb(
+                to_dict(
+                    asset_name=asset_name,
+                    visibility_points=visibility_points,
+                    albedo_path=albedo_path,
+                    metallic_smoothness_path=metallic_smoothness_path,
+                    normal_path=normal_path,
+                    emission_path=emission_path,
+                    receptacle=receptacle,
+                    annotation_dict=annotation_dict,
+                )
+            )
+        )
+
+
 def compress_file(input_file_path: str, output_file_path: str, compresslevel=2):
     with open(input_file_path, "rb") as f_in:
         with gzip.open(output_file_path, "wb", compresslevel=compresslevel) as f_out:
@@ -1011,6 +1074,10 @@ def get_json_save_path(out_dir, object_name):
     return os.path.join(out_dir, f"{object_name}.json")
 
 
+def get_msgpack_save_path(out_dir, object_name):
+    return os.path.join(out_dir, f"{object_name}.msgpack")
+
+
 def get_picklegz_save_path(out_dir, object_name):
     return os.path.join(out_dir, f"{object_name}.pkl.gz")
 
@@ -1023,6 +1090,8 @@ def glb_to_thor(
     save_obj: bool,
     engine="CYCLES",
     relative_texture_paths=True,
+    texture_format="png",
+    intermediate_format="json",
 ):
     logging.basicConfig(level=logging.DEBUG, format=FORMAT)
 
@@ -1434,23 +1503,23 @@ def glb_to_thor(
     bake_mat.node_tree.nodes.active = bake_mat_ti_albedo
     bpy.ops.object.bake(type="DIFFUSE")
 
-    albedo_map_name = "albedo.png"
+    albedo_map_name = f"albedo.{texture_format}"
     # Save out albedo map texture
     data_block = bpy.data.images["Target_Object_Albedo_Bake"]
     logger.debug(f"Saving {albedo_map_name}...")
     albedo_save_path = os.path.join(output_dir, albedo_map_name)
-    data_block.save_render(filepath=albedo_save_path)
+    save_texture(data_block, albedo_save_path, texture_format=texture_format)
 
     # Normal bake
     bake_mat.node_tree.nodes.active = bake_mat_ti_normal
     bpy.ops.object.bake(type="NORMAL")
 
-    normal_map_name = "normal.png"
+    normal_map_name = f"normal.{texture_format}"
     # Save out normal map texture
     data_block = bpy.data.images["Target_Object_Normal_Bake"]
     logger.debug(f"Saving {normal_map_name}...")
     normal_save_path = os.path.join(output_dir, normal_map_name)
-    data_block.save_render(filepath=normal_save_path)
+    save_texture(data_block, normal_save_path, texture_format=texture_format)
 
     # Metallic bake
     link_to_mat_output(source_object, socket_connections)
@@ -1496,12 +1565,12 @@ def glb_to_thor(
     bake_mat.node_tree.nodes.active = bake_mat_ti_emission
     bpy.ops.object.bake(type="EMIT")
 
-    emission_map_name = "emission.png"
+    emission_map_name = f"emission.{texture_format}"
     # Save out emission map texture
     data_block = bpy.data.images["Target_Object_Emission_Bake"]
     logger.debug(f"Saving {emission_map_name}...")
     emission_save_path = os.path.join(output_dir, emission_map_name)
-    data_block.save_render(filepath=emission_save_path)
+    save_texture(data_block, emission_save_path, texture_format=texture_format)
 
     # # Transparency bake
     # if len(source_object.material_slots) > 0:
@@ -1679,9 +1748,8 @@ def glb_to_thor(
 
     visibility_points = get_visibility_points(target_object, visualize=True)
 
-    save_json(
+    save_kwargs = dict(
         asset_name=object_name,
-        save_path=json_save_path,
         visibility_points=visibility_points,
         albedo_path=albedo_path,
         metallic_smoothness_path=metallic_smoothness_path,
@@ -1690,6 +1758,19 @@ def glb_to_thor(
         receptacle=receptacle,
         annotation_dict=annotation_dict,
     )
+    if intermediate_format == "msgpack":
+        try:
+            save_msgpack(
+                save_path=get_msgpack_save_path(output_dir, object_name),
+                **save_kwargs,
+            )
+        except ImportError:
+            logger.warning(
+                "msgpack is not installed in blender's python, saving asset as json instead."
+            )
+            save_json(save_path=json_save_path, **save_kwargs)
+    else:
+        save_json(save_path=json_save_path, **save_kwargs)
 
     # Re-orient object post-export, for visual feedback
     mirror_object(target_object)
@@ -1737,6 +1818,23 @@ if __name__ == "__main__":
 
     parser.add_argument("--obj", action="store_true")
 
+    parser.add_argument(
+        "--intermediate_format",
+        type=str,
+        default="json",
+        choices=["json", "msgpack"],
+        help="Format to save the asset in, msgpack is considerably faster to save and load for large assets.",
+    )
+
+    parser.add_argument(
+        "--texture_format",
+        type=str,
+        default="png",
+        choices=["png", "jpg"],
+        help="Format to save the albedo, normal, and emission textures in. The metallic smoothness"
+        " texture is always saved as a png as its smoothness is stored in the alpha channel.",
+    )
+
     argv = sys.argv[sys.argv.index("--") + 1 :]
     args = parser.parse_args(argv)
     glb_to_thor(
@@ -1746,4 +1844,6 @@ if __name__ == "__main__":
         annotations_file=args.annotations,
         save_obj=args.obj,
         relative_texture_paths=args.relative_texture_paths,
+        texture_format=args.texture_format,
+        intermediate_format=args.intermediate_format,
     )
@@ -1,23 +1,53 @@
 import argparse
+import functools
 import glob
+import itertools
 import json
 import logging
 import multiprocessing
 import os
+import selectors
+import shlex
 import subprocess
 import sys
 import time
 import traceback
+import warnings
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
 from contextlib import contextmanager
-from time import perf_counter
-from typing import Any, List, Dict, Sequence, Optional, Union, Literal
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-import PIL.Image
 import ai2thor.controller
 import numpy as np
 import objaverse
 from tqdm import tqdm
 
+try:
+    import numba
+except ImportError:
+    numba = None  # type: ignore[assignment]
+
 import objathor
 from objathor.asset_conversion.colliders.generate_colliders import generate_colliders
 
@@ -30,6 +60,8 @@ from objathor.asset_conversion.util import (
     OrderedDictWithDefault,
     get_existing_thor_asset_file_path,
     compress_image_to_ssim_threshold,
+    encode_jpeg,
+    load_image,
     load_existing_thor_asset_file,
     save_thor_asset_file,
     get_extension_save_path,
@@ -43,6 +75,8 @@ logger = logging.getLogger(__name__)
 BLENDER_PROCESS_FAIL = "blender_process_fail"
 BLENDER_PROCESS_TIMEOUT_FAIL = "blender_process_timeout_fail"
 IMAGE_COMPRESS_FAIL = "png_to_jpg_compression_fail"
+
+BLENDER_PROGRESS_COMPLETE = b"Progress: 100.00%"
 GENERATE_COLLIDERS_FAIL = "vhacd_generate_colliders_fail"
 THOR_CREATE_ASSET_FAIL = "thor_create_asset_fail"
 THOR_VIEW_ASSET_FAIL = "thor_view_asset_in_thor_fail"
@@ -50,12 +84,12 @@ THOR_PROCESS_FAILURE = "thor_process_fail"
 
 
 @contextmanager
-def Timer(s: str, pad_len: int = 70) -> float:
-    s = (f"{{:<{pad_len}}}").format(s)
-    print((f"{s}: starting").format(s), flush=True)
-    start = perf_counter()
+def Timer(s: str, pad_len: int = 70) -> Iterator[None]:
+    s = s.ljust(pad_len)
+    print(f"{s}: starting", flush=True)
+    start = time.monotonic_ns()
     yield None
-    print(f"{s}: took {perf_counter() - start:.2f}s", flush=True)
+    print(f"{s}: took {(time.monotonic_ns() - start) / 1e9:.2f}s", flush=True)
 
 
 def save_asset_as(asset_id, asset_out_dir, extension, keep_json_asset=False):
@@ -76,6 +110,64 @@ def save_asset_as(asset_id, asset_out_dir, extension, keep_json_asset=False):
         os.remove(json_asset_path)
 
 
+def _run_and_stream_output(
+    command: List[str],
+    timeout: Optional[float] = None,
+    max_output_chunks: int = 16,
+) -> Tuple[int, str, bool]:
+    """
+    Runs `command` (with stderr merged into stdout), streaming its output rather than buffering all
+    of it. Only the last `max_output_chunks` reads (64KB each) of output are kept in memory.
+    If the process runs longer than `timeout` seconds it is killed and `subprocess.TimeoutExpired`
+    is raised.
+
+    :return: Tuple of `(return_code, output_tail, progress_complete)` where `progress_complete` is
+     whether blender reported reaching 100% progress at any point.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def time_remaining() -> Optional[float]:
+        return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+    output_tail: Deque[bytes] = deque(maxlen=max_output_chunks)
+    progress_complete = False
+    # Keep the end of the previous read so we notice the marker when it's split across reads
+    prev_end = b""
+    with subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    ) as process:
+        assert process.stdout is not None
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(process.stdout, selectors.EVENT_READ)
+                fd = process.stdout.fileno()
+                while True:
+                    if not selector.select(time_remaining()):
+                        assert timeout is not None
+                        raise subprocess.TimeoutExpired(
+                            command, timeout, output=b"".join(output_tail)
+                        )
+                    chunk = os.read(fd, 1 << 16)
+                    if not chunk:
+                        break
+                    output_tail.append(chunk)
+                    if not progress_complete:
+                        progress_complete = (
+                            BLENDER_PROGRESS_COMPLETE in prev_end + chunk
+                        )
+                        prev_end = chunk[-(len(BLENDER_PROGRESS_COMPLETE) - 1) :]
+            process.wait(timeout=time_remaining())
+        except BaseException:
+            process.kill()
+            raise
+
+    return (
+        process.returncode,
+        b"".join(output_tail).decode(errors="replace"),
+        progress_complete,
+    )
+
+
 def glb_to_thor(
     glb_path: str,
     annotations_path: str,
@@ -88,8 +180,18 @@ def glb_to_thor(
     relative_texture_paths=True,
     run_blender_as_module=None,
     blender_installation_path=None,
-):
+    texture_format: Literal["png", "jpg"] = "png",
+    intermediate_format: Literal["json", "msgpack"] = "json",
+) -> bool:
+    """
+    Converts the GLB at `glb_path` into a THOR asset (with compressed textures and default annotations)
+    saved in `object_out_dir`.
+
+    :return: Whether the conversion succeeded, on failure the reason is recorded in `failed_objects`.
+    """
     os.makedirs(object_out_dir, exist_ok=True)
+    glb_abs_path = os.path.abspath(glb_path)
+    out_abs_dir = Path(os.path.abspath(object_out_dir))
 
     if run_blender_as_module is None:
         try:
@@ -101,60 +203,58 @@ def glb_to_thor(
         logger.info(f"---- Autodetected run_blender_as_module={run_blender_as_module}")
 
     if not run_blender_as_module:
-        command = (
-            f"{blender_installation_path if blender_installation_path is not None else get_blender_installation_path()}"
-            f" --background"
-            f" --python {os.path.join(ABS_PATH_OF_OBJATHOR, 'asset_conversion', 'object_consolidater.py')}"
-            f" --"
-        )
+        command = [
+            (
+                blender_installation_path
+                if blender_installation_path is not None
+                else get_blender_installation_path()
+            ),
+            "--background",
+            "--python",
+            os.path.join(
+                ABS_PATH_OF_OBJATHOR, "asset_conversion", "object_consolidater.py"
+            ),
+            "--",
+        ]
     else:
-        command = (
-            f"python"
-            f" -m"
-            f" objathor.asset_conversion.object_consolidater"
-            f" --"
-            f' --object_path="{os.path.abspath(glb_path)}"'
-            f' --output_dir="{os.path.abspath(object_out_dir)}"'
-            f' --annotations="{annotations_path}"'
-        )
-
-    command += (
-        f' --object_path="{os.path.abspath(glb_path)}"'
-        f' --output_dir="{os.path.abspath(object_out_dir)}"'
-        f' --annotations="{annotations_path}"'
+        command = [
+            sys.executable,
+            "-m",
+            "objathor.asset_conversion.object_consolidater",
+            "--",
+        ]
+
+    command.extend(
+        [
+            f"--object_path={glb_abs_path}",
+            f"--output_dir={out_abs_dir}",
+            f"--annotations={annotations_path}",
+            f"--texture_format={texture_format}",
+            f"--intermediate_format={intermediate_format}",
+        ]
     )
 
     if generate_obj:
-        command = command + " --obj"
+        command.append("--obj")
 
     if relative_texture_paths:
-        command = command + " --relative_texture_paths"
+        command.append("--relative_texture_paths")
 
     if not capture_stdout:
-        print(f"For {uid}, running command: {command}")
+        print(f"For {uid}, running command: {shlex.join(command)}")
 
-    process = None
     out = None
     timeout_hit = False
+    progress_complete = False
     try:
-        process = subprocess.Popen(
-            command,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            env=os.environ.copy(),
+        result_code, out, progress_complete = _run_and_stream_output(
+            command, timeout=timeout
         )
-        out, _ = process.communicate(timeout=timeout)
-        out = out.decode()
-        result_code = process.returncode
         if result_code != 0:
             raise subprocess.CalledProcessError(result_code, command)
     except subprocess.TimeoutExpired:
-        if process:
-            process.kill()
-            process.wait(timeout=timeout)
         result_code = -1
-        out = f"Command timed out, command: {command}"
+        out = f"Command timed out, command: {shlex.join(command)}"
         timeout_hit = True
     except subprocess.CalledProcessError as e:
         result_code = e.returncode
@@ -176,15 +276,13 @@ def glb_to_thor(
     if not capture_stdout:
         print(f"Exited with code {result_code}")
 
-    success = result_code == 0 and os.path.exists(
-        os.path.join(object_out_dir, f"{uid}.obj")
-    )
+    success = result_code == 0 and os.path.exists(out_abs_dir / f"{uid}.obj")
 
     if success:
         if not capture_stdout:
             print(f"---- Command ran successfully for {uid} at path {glb_path}")
     else:
-        if "Progress: 100.00%" in out:
+        if progress_complete:
             # Blender bug process exits with error due to minor memory leak but object is converted successfully
             success = True
         else:
@@ -203,25 +301,21 @@ def glb_to_thor(
 
         # TODO: here optimize to remove needing to decompress and change references,
         # always export as json from blender pipeline and change to desired compression here
-        asset_json = load_existing_thor_asset_file(os.path.abspath(object_out_dir), uid)
+        asset_json = load_existing_thor_asset_file(str(out_abs_dir), uid)
 
-        save_dir = os.path.dirname(thor_obj_path)
+        save_dir = Path(thor_obj_path).parent
+        converted_textures = []
         for k in [
             "albedo",
             "metallic_smoothness",
             "normal",
             "emission",
-            "roughness",
-            "metallic",
         ]:
-            png_path = os.path.join(save_dir, f"{k}.png")
-            jpg_path = os.path.join(save_dir, f"{k}.jpg")
-
-            if k in ["roughness", "metallic"]:
-                # We don't need these maps as we have `metallic_smoothness`
-                if os.path.exists(png_path):
-                    os.remove(png_path)
+            png_path = str(save_dir / f"{k}.png")
+            jpg_path = str(save_dir / f"{k}.jpg")
 
+            if k != "metallic_smoothness" and texture_format == "jpg":
+                # Blender has already saved this texture as a jpg and the asset references it
                 continue
 
             input_path = png_path
@@ -229,13 +323,13 @@ def glb_to_thor(
                 # Don't want to convert metallic smoothness to jpg as this would destroy the smoothness
                 # which is encoded in the alpha channel. Instead we move the smoothness to the B channel
                 # (which isn't storing any relevant information) and then convert to jpg.
-                img = np.array(
-                    PIL.Image.open(input_path).convert("RGBA"), dtype=np.uint8
-                )
-                img[:, :, 1] = img[:, :, 0]
-                img[:, :, 2] = img[:, :, 3]
-                img[:, :, 3] = 255
-                PIL.Image.fromarray(img).convert("RGB").save(jpg_path)
+                img = np.asarray(load_image(input_path).convert("RGBA"))
+                repacked = np.empty((*img.shape[:2], 3), dtype=np.uint8)
+                repacked[:, :, 0] = img[:, :, 0]
+                repacked[:, :, 1] = img[:, :, 0]
+                repacked[:, :, 2] = img[:, :, 3]
+                with open(jpg_path, "wb") as f:
+                    f.write(encode_jpeg(repacked, quality=75))
                 input_path = jpg_path
 
             compress_image_to_ssim_threshold(
@@ -244,15 +338,21 @@ def glb_to_thor(
                 threshold=0.95,
             )
 
-            if k not in ["roughness", "metallic"]:
-                os.remove(png_path)
+            converted_textures.append(k)
 
-                if k == "metallic_smoothness":
-                    k = "metallicSmoothness"
+        for k in converted_textures:
+            try:
+                os.remove(save_dir / f"{k}.png")
+            except FileNotFoundError:
+                pass
 
-                asset_json[f"{k}TexturePath"] = asset_json[f"{k}TexturePath"].replace(
-                    ".png", ".jpg"
-                )
+        texture_path_keys = [
+            f"{'metallicSmoothness' if k == 'metallic_smoothness' else k}TexturePath"
+            for k in converted_textures
+        ]
+        asset_json.update(
+            {key: asset_json[key].replace(".png", ".jpg") for key in texture_path_keys}
+        )
 
         y_rot = compute_thor_rotation_to_obtain_min_bounding_box(
             asset_json["vertices"], max_deg_change=45, increments=91
@@ -260,6 +360,9 @@ def glb_to_thor(
         asset_json["yRotOffset"] = y_rot
         print(f"Pose adjusted by {y_rot:.2f} degrees ({uid})")
 
+        asset_json = add_default_annotations(
+            asset_json, asset_directory=str(out_abs_dir)
+        )
         save_thor_asset_file(asset_json, thor_obj_path)
     except (SystemExit, KeyboardInterrupt):
         raise
@@ -282,8 +385,42 @@ def compute_axis_aligned_bbox_volume(
     return float((maxes - mins).prod())
 
 
+if numba is not None:
+
+    # Not `parallel=True` as this usually runs inside (multiple) pipeline worker processes. We avoid
+    # the no-nans/no-infs fastmath flags as those make any nan/inf in the vertices undefined behaviour.
+    @numba.njit(cache=True, fastmath={"contract", "reassoc", "arcp"})
+    def _y_rotation_bbox_volumes(vertices: np.ndarray, thetas: np.ndarray):
+        """
+        Axis aligned bounding box volumes of the (3, V) `vertices` after rotating them by each of
+        `thetas` around the y-axis, computed in a single pass over the vertices per theta.
+        """
+        volumes = np.empty(len(thetas), dtype=np.float64)
+        for i in range(len(thetas)):
+            c = np.cos(thetas[i])
+            s = np.sin(thetas[i])
+            x_min = x_max = c * vertices[0, 0] - s * vertices[2, 0]
+            y_min = y_max = vertices[1, 0]
+            z_min = z_max = s * vertices[0, 0] + c * vertices[2, 0]
+            for v in range(1, vertices.shape[1]):
+                x = c * vertices[0, v] - s * vertices[2, v]
+                y = vertices[1, v]
+                z = s * vertices[0, v] + c * vertices[2, v]
+                x_min = min(x_min, x)
+                x_max = max(x_max, x)
+                y_min = min(y_min, y)
+                y_max = max(y_max, y)
+                z_min = min(z_min, z)
+                z_max = max(z_max, z)
+            volumes[i] = (x_max - x_min) * (y_max - y_min) * (z_max - z_min)
+        return volumes
+
+else:
+    _y_rotation_bbox_volumes = None
+
+
 def compute_thor_rotation_to_obtain_min_bounding_box(
-    vertices: List[Dict[str, float]],
+    vertices: Union[List[Dict[str, float]], np.ndarray, bytes],
     max_deg_change: float,
     increments: int = 31,
     bias_for_no_rotation: float = 0.01,
@@ -292,7 +429,8 @@ def compute_thor_rotation_to_obtain_min_bounding_box(
     Computes the (approximate) rotation in [-max_deg_change, max_deg_change] around the y-axis that
      minimizes the volume of the axis aligned bounding box.
 
-    :param vertices: list of vertices
+    :param vertices: list of {"x": ..., "y": ..., "z": ...} vertices (as stored in THOR assets), an (N, 3)
+     array, or the bytes of a flat float32 [x0, y0, z0, x1, ...] buffer
     :param max_deg_change: maximum rotation in degrees
     :param increments: number of increments to try
     :param bias_for_no_rotation: Bias to use no rotation by rescaling no rotation volume by (1-bias_for_no_rotation)
@@ -302,27 +440,40 @@ def compute_thor_rotation_to_obtain_min_bounding_box(
         increments >= 1 and increments % 2 == 1
     ), "Increments must be non-negative and odd"
 
-    vertices_arr = np.array(
-        [[v["x"], v["y"], v["z"]] for v in vertices], dtype=np.float32
-    )
+    if isinstance(vertices, (bytes, bytearray, memoryview)):
+        vertices_arr = np.frombuffer(vertices, dtype=np.float32).reshape(-1, 3)
+    elif isinstance(vertices, np.ndarray):
+        vertices_arr = vertices.astype(np.float32, copy=False).reshape(-1, 3)
+    else:
+        vertices_arr = np.fromiter(
+            itertools.chain.from_iterable((v["x"], v["y"], v["z"]) for v in vertices),
+            dtype=np.float32,
+            count=3 * len(vertices),
+        ).reshape(-1, 3)
     vertices_arr = vertices_arr.transpose((1, 0))
 
-    def get_rotmat(t):
-        return np.array(
-            [  # rotation matrix for rotating around the y axis
-                [np.cos(t), 0, -np.sin(t)],
-                [0, 1, 0],
-                [np.sin(t), 0, np.cos(t)],
-            ]
-        )
-
     max_rad_change = np.deg2rad(max_deg_change)
     thetas = np.linspace(start=-max_rad_change, stop=max_rad_change, num=increments)
-    volumes = []
-    for theta in thetas:
-        volumes.append(
-            compute_axis_aligned_bbox_volume(np.matmul(get_rotmat(theta), vertices_arr))
-        )
+
+    # The kernel doesn't bounds check, so leave meshes without vertices to numpy (which raises)
+    if _y_rotation_bbox_volumes is not None and vertices_arr.shape[1] > 0:
+        volumes = _y_rotation_bbox_volumes(np.ascontiguousarray(vertices_arr), thetas)
+    else:
+        # Rotating all thetas at once (e.g. with einsum) needs an (increments, 3, V) temporary which,
+        # for large meshes, is slower than rotating into a single reused (3, V) buffer per theta
+        rotmat = np.zeros((3, 3), dtype=np.float32)
+        rotmat[1, 1] = 1
+        rotated = np.empty_like(vertices_arr)
+        volumes = np.empty(len(thetas), dtype=np.float64)
+        for i, theta in enumerate(thetas):
+            # rotation matrix for rotating around the y axis
+            cos, sin = np.cos(theta), np.sin(theta)
+            rotmat[0, 0] = cos
+            rotmat[0, 2] = -sin
+            rotmat[2, 0] = sin
+            rotmat[2, 2] = cos
+            np.matmul(rotmat, vertices_arr, out=rotated)
+            volumes[i] = (rotated.max(axis=1) - rotated.min(axis=1)).prod()
 
     volumes[len(volumes) // 2] *= 1 - bias_for_no_rotation
 
@@ -457,9 +608,308 @@ def validate_in_thor(
         return False, None
 
 
+def create_thor_controller(
+    thor_platform: Optional[str] = None,
+    width: int = 300,
+    height: int = 300,
+    skip_thor_render: bool = False,
+) -> ai2thor.controller.Controller:
+    """
+    Starts a THOR controller suitable for `validate_in_thor`. Starting Unity takes several seconds so
+    callers processing multiple batches should create the controller once and pass it to
+    `optimize_assets_for_thor`.
+    """
+    import ai2thor.fifo_server
+
+    return ai2thor.controller.Controller(
+        commit_id=THOR_COMMIT_ID,
+        fieldOfView=46,
+        platform=thor_platform,
+        start_unity=True,
+        scene="Procedural",
+        gridSize=0.25,
+        width=width,
+        height=height,
+        server_class=ai2thor.fifo_server.FifoServer,
+        antiAliasing=None if skip_thor_render else "fxaa",
+        quality="Very Low" if skip_thor_render else "Ultra",
+        makeAgentsVisible=False,
+    )
+
+
+def _convert_glb(
+    uid: str,
+    glb_path: str,
+    output_dir: str,
+    annotations_path: str,
+    blender_as_module: bool,
+    skip_conversion: bool,
+    blender_installation_path: Optional[str],
+    live: bool,
+    absolute_texture_paths: bool,
+    log_prefix: str,
+    timeout: Optional[int],
+    texture_format: Literal["png", "jpg"],
+    intermediate_format: Literal["json", "msgpack"],
+) -> Tuple[str, bool, Optional[Dict[str, Any]]]:
+    """
+    Blender stage of the pipeline: converts a single GLB into a THOR asset. Only writes
+    to the asset's own output directory so it can safely run in a worker process.
+
+    :return: Tuple of `(uid, success, failure_info)` where `failure_info` is None on success.
+    """
+    failed_objects = OrderedDictWithDefault(dict)
+    asset_out_dir = os.path.join(output_dir, uid)
+
+    if os.path.isdir(annotations_path):
+        if os.path.exists(os.path.join(annotations_path, f"{uid}.json")):
+            sub_annotations_path = os.path.join(annotations_path, f"{uid}.json")
+        elif os.path.exists(
+            os.path.join(annotations_path, uid, f"annotations.json.gz")
+        ):
+            sub_annotations_path = os.path.join(
+                annotations_path, uid, f"annotations.json.gz"
+            )
+        else:
+            raise RuntimeError(
+                f"Annotations path {annotations_path} does not contain annotations for {uid}"
+            )
+    else:
+        sub_annotations_path = annotations_path
+
+    success = True
+    if not skip_conversion:
+        with Timer(f"{log_prefix}GLB to THOR ({uid})"):
+            success = glb_to_thor(
+                glb_path=glb_path,
+                annotations_path=sub_annotations_path,
+                object_out_dir=asset_out_dir,
+                uid=uid,
+                failed_objects=failed_objects,
+                capture_stdout=not live,
+                generate_obj=True,
+                relative_texture_paths=not absolute_texture_paths,
+                run_blender_as_module=blender_as_module,
+                blender_installation_path=blender_installation_path,
+                timeout=timeout,
+                texture_format=texture_format,
+                intermediate_format=intermediate_format,
+            )
+        assert success == (uid not in failed_objects)
+
+    return uid, success, failed_objects.get(uid)
+
+
+def _generate_colliders_and_save(
+    uid: str,
+    glb_path: str,
+    output_dir: str,
+    max_colliders: int,
+    extension: str,
+    skip_conversion: bool,
+    skip_colliders: bool,
+    live: bool,
+    delete_objs: bool,
+    keep_json_asset: bool,
+    log_prefix: str,
+    extra_collider_kwargs: Dict[str, Any],
+) -> Tuple[str, bool, Optional[Dict[str, Any]]]:
+    """
+    Collider stage of the pipeline: generates colliders for an already converted asset and
+    saves it with the requested extension.
+
+    :return: Tuple of `(uid, success, failure_info)` where `failure_info` is None on success.
+    """
+    failed_objects = OrderedDictWithDefault(dict)
+    asset_out_dir = os.path.join(output_dir, uid)
+
+    success = True
+    if success and not skip_colliders:
+        with Timer(f"{log_prefix}OBJ to collider ({uid})"):
+            success = obj_to_colliders(
+                uid=uid,
+                object_out_dir=asset_out_dir,
+                max_colliders=max_colliders,
+                capture_stdout=(not live),
+                failed_objects=failed_objects,
+                delete_objs=delete_objs,
+                **{
+                    "timeout": 60,
+                    **extra_collider_kwargs,
+                },
+            )
+        assert success == (uid not in failed_objects)
+
+    if success and (not skip_conversion) and (not skip_colliders):
+        with Timer(
+            f"{log_prefix}Saving {asset_out_dir} {uid} with extension {extension}"
+        ):
+            # Save to desired format, compression step
+            save_path = get_extension_save_path(
+                out_dir=asset_out_dir, asset_id=uid, extension=extension
+            )
+            # `glb_to_thor` has already added the default annotations and `obj_to_colliders` has
+            # saved the colliders to the intermediate (json or msgpack) asset, so we only need to
+            # re-save when the requested extension differs from the intermediate one
+            intermediate_path = get_existing_thor_asset_file_path(
+                out_dir=asset_out_dir, asset_id=uid
+            )
+            if intermediate_path != save_path:
+                save_thor_asset_file(
+                    asset_json=load_existing_thor_asset_file(
+                        out_dir=asset_out_dir, object_name=uid
+                    ),
+                    save_path=save_path,
+                )
+                # Despite its name, `keep_json_asset` keeps the intermediate (json or msgpack) asset
+                if not keep_json_asset:
+                    print(
+                        f"{log_prefix}Removing intermediate {os.path.basename(intermediate_path)} asset"
+                    )
+                    os.remove(intermediate_path)
+
+            # Get size of GLB asset in MB
+            glb_size = os.path.getsize(glb_path) / (1024 * 1024)
+            # Get size of optimized asset in MB
+            asset_size = os.path.getsize(save_path) / (1024 * 1024)
+            with os.scandir(asset_out_dir) as it:
+                asset_size += sum(
+                    entry.stat().st_size for entry in it if entry.name.endswith(".jpg")
+                ) / (1024 * 1024)
+
+            print(
+                f"{log_prefix}Original asset size {glb_size:.2f} MB,"
+                f" new asset size {asset_size:.2f}MB ({100 * (1 - asset_size / glb_size):0.2f}% reduction)",
+                flush=True,
+            )
+
+    return uid, success, failed_objects.get(uid)
+
+
+def _run_conversion_stages(
+    uid_glb_paths: Iterable[Tuple[str, str]],
+    convert_glb: Callable[[str, str], Tuple[str, bool, Optional[Dict[str, Any]]]],
+    generate_colliders_and_save: Callable[
+        [str, str], Tuple[str, bool, Optional[Dict[str, Any]]]
+    ],
+    num_workers: int,
+    max_queued: int = 4,
+) -> Iterator[Tuple[str, bool, Optional[Dict[str, Any]]]]:
+    """
+    Runs the blender and collider stages for every asset, yielding `(uid, success, failure_info)`
+    as soon as an asset has made it through both stages (or failed in one of them).
+
+    With `num_workers > 1` each stage gets its own pool of `num_workers // 2` processes so blender
+    conversions, collider generation, and whatever the caller does with the yielded results
+    (i.e. THOR validation) all overlap. At most `max_queued` assets wait in front of each pool
+    so that a slow downstream stage applies backpressure rather than letting work pile up.
+    `uid_glb_paths` is consumed lazily so it may be a stream of assets that are still being downloaded.
+    """
+    if num_workers <= 1:
+        for uid, glb_path in uid_glb_paths:
+            uid, success, failure_info = convert_glb(uid, glb_path)
+            if success:
+                uid, success, failure_info = generate_colliders_and_save(uid, glb_path)
+            yield uid, success, failure_info
+        return
+
+    stage_workers = max(num_workers // 2, 1)
+    max_in_flight = stage_workers + max_queued
+    todo = iter(uid_glb_paths)
+    # Keyed by future rather than uid so repeated uids can't clobber each other
+    blender_future_to_glb_path: Dict[Future, str] = {}
+    with ProcessPoolExecutor(
+        max_workers=stage_workers
+    ) as blender_pool, ProcessPoolExecutor(max_workers=stage_workers) as collider_pool:
+        blender_futures: Set[Future] = set()
+        collider_futures: Set[Future] = set()
+
+        def submit_blender_work():
+            num_to_submit = min(
+                max_in_flight - len(blender_futures),
+                max_in_flight - len(collider_futures),
+            )
+            for uid, glb_path in itertools.islice(todo, max(num_to_submit, 0)):
+                future = blender_pool.submit(convert_glb, uid, glb_path)
+                blender_future_to_glb_path[future] = glb_path
+                blender_futures.add(future)
+
+        submit_blender_work()
+        try:
+            while blender_futures or collider_futures:
+                done, _ = wait(
+                    blender_futures | collider_futures, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    if future in blender_futures:
+                        blender_futures.remove(future)
+                        glb_path = blender_future_to_glb_path.pop(future)
+                        uid, success, failure_info = future.result()
+                        if success:
+                            collider_futures.add(
+                                collider_pool.submit(
+                                    generate_colliders_and_save, uid, glb_path
+                                )
+                            )
+                        else:
+                            yield uid, success, failure_info
+                    else:
+                        collider_futures.remove(future)
+                        yield future.result()
+                submit_blender_work()
+        finally:
+            for future in blender_futures | collider_futures:
+                future.cancel()
+
+
+def _download_objaverse_glb(args: Tuple[str, str, int, int]) -> Tuple[str, str]:
+    return objaverse._download_object(*args)
+
+
+def download_objaverse_glbs(
+    uids: Sequence[str],
+    num_processes: Optional[int] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yields `(uid, glb_path)` pairs for the given objaverse `uids`, downloading any GLBs that
+    are not already available locally in a pool of `num_processes` processes. The objaverse
+    object path index is loaded once here so the workers only download. Already downloaded
+    objects are yielded immediately and the rest as soon as each one finishes, so passing
+    this to `optimize_assets_for_thor` lets conversion start while objects are still downloading.
+    """
+    if num_processes is None:
+        num_processes = multiprocessing.cpu_count()
+
+    object_paths = objaverse._load_object_paths()
+    to_download = []
+    # Drop duplicates (as `objaverse.load_objects` did) so each uid is only converted once
+    for uid in dict.fromkeys(uid[:-4] if uid.endswith(".glb") else uid for uid in uids):
+        if uid not in object_paths:
+            warnings.warn(f"Could not find object with uid {uid}. Skipping it.")
+            continue
+        local_path = os.path.join(objaverse._VERSIONED_PATH, object_paths[uid])
+        if os.path.exists(local_path):
+            yield uid, local_path
+        else:
+            to_download.append((uid, object_paths[uid]))
+
+    if len(to_download) == 0:
+        return
+
+    start_file_count = len(
+        glob.glob(os.path.join(objaverse._VERSIONED_PATH, "glbs", "*", "*.glb"))
+    )
+    args = [
+        (uid, object_path, len(to_download), start_file_count)
+        for uid, object_path in to_download
+    ]
+    with multiprocessing.Pool(processes=min(num_processes, len(args))) as pool:
+        yield from pool.imap_unordered(_download_objaverse_glb, args)
+
+
 def optimize_assets_for_thor(
     output_dir: str,
-    uid_to_glb_path: Dict[str, str],
+    uid_to_glb_path: Union[Dict[str, str], Iterable[Tuple[str, str]]],
     annotations_path: str,
     max_colliders: int,
     blender_as_module: bool,
@@ -483,8 +933,18 @@ def optimize_assets_for_thor(
     report_out_file_name: Optional[str] = "failed_objects.json",
     log_prefix="",
     timeout: Optional[int] = None,
+    num_workers: int = 1,
+    texture_format: Literal["png", "jpg"] = "png",
     **extra_collider_kwargs: Dict[str, Any],
 ) -> Dict[str, Dict[str, Any]]:
+    """
+    Converts, generates colliders for, and (optionally) validates in THOR every asset in
+    `uid_to_glb_path`. When `num_workers > 1` the conversion and collider steps run in
+    separate process pools (see `_run_conversion_stages`) while THOR validation, which
+    requires a single controller, runs in this process as assets come out of those pools.
+    `uid_to_glb_path` may also be an iterable of `(uid, glb_path)` pairs (e.g. from
+    `download_objaverse_glbs`) in which case assets are processed as they become available.
+    """
     report_out_path: Optional[str] = None
     if report_out_file_name is not None:
         report_out_path = os.path.join(output_dir, report_out_file_name)
@@ -493,125 +953,69 @@ def optimize_assets_for_thor(
 
     start_process_time = time.perf_counter()
 
+    convert_glb = functools.partial(
+        _convert_glb,
+        output_dir=output_dir,
+        annotations_path=annotations_path,
+        blender_as_module=blender_as_module,
+        skip_conversion=skip_conversion,
+        blender_installation_path=blender_installation_path,
+        live=live,
+        absolute_texture_paths=absolute_texture_paths,
+        log_prefix=log_prefix,
+        timeout=timeout,
+        texture_format=texture_format,
+        # Have blender write msgpack directly when that's the requested output format
+        intermediate_format="msgpack" if extension.startswith(".msgpack") else "json",
+    )
+    generate_colliders_and_save = functools.partial(
+        _generate_colliders_and_save,
+        output_dir=output_dir,
+        max_colliders=max_colliders,
+        extension=extension,
+        skip_conversion=skip_conversion,
+        skip_colliders=skip_colliders,
+        live=live,
+        delete_objs=delete_objs,
+        keep_json_asset=keep_json_asset,
+        log_prefix=log_prefix,
+        extra_collider_kwargs=extra_collider_kwargs,
+    )
+
     given_controller = controller is not None
     try:
-        for uid, glb_path in tqdm(uid_to_glb_path.items()):
+        uid_glb_paths: Iterable[Tuple[str, str]]
+        num_objects: Optional[int]
+        if isinstance(uid_to_glb_path, dict):
+            uid_glb_paths, num_objects = uid_to_glb_path.items(), len(uid_to_glb_path)
+        else:
+            uid_glb_paths, num_objects = uid_to_glb_path, None
+
+        results = _run_conversion_stages(
+            uid_glb_paths=uid_glb_paths,
+            convert_glb=convert_glb,
+            generate_colliders_and_save=generate_colliders_and_save,
+            num_workers=num_workers,
+        )
+        num_processed = 0
+        for uid, success, failure_info in tqdm(results, total=num_objects):
+            num_processed += 1
             start_obj_time = time.perf_counter()
             asset_out_dir = os.path.join(output_dir, uid)
             metadata_output_file = os.path.join(asset_out_dir, "thor_metadata.json")
 
-            if os.path.isdir(annotations_path):
-                if os.path.exists(os.path.join(annotations_path, f"{uid}.json")):
-                    sub_annotations_path = os.path.join(annotations_path, f"{uid}.json")
-                elif os.path.exists(
-                    os.path.join(annotations_path, uid, f"annotations.json.gz")
-                ):
-                    sub_annotations_path = os.path.join(
-                        annotations_path, uid, f"annotations.json.gz"
-                    )
-                else:
-                    raise RuntimeError(
-                        f"Annotations path {annotations_path} does not contain annotations for {uid}"
-                    )
-            else:
-                sub_annotations_path = annotations_path
-
-            success = True
-            if not skip_conversion:
-                with Timer(f"{log_prefix}GLB to THOR ({uid})"):
-                    success = glb_to_thor(
-                        glb_path=glb_path,
-                        annotations_path=sub_annotations_path,
-                        object_out_dir=asset_out_dir,
-                        uid=uid,
-                        failed_objects=failed_objects,
-                        capture_stdout=not live,
-                        generate_obj=True,
-                        relative_texture_paths=not absolute_texture_paths,
-                        run_blender_as_module=blender_as_module,
-                        blender_installation_path=blender_installation_path,
-                        timeout=timeout,
-                    )
-                assert success == (uid not in failed_objects)
-
-            if success and not skip_colliders:
-                with Timer(f"{log_prefix}OBJ to collider ({uid})"):
-                    success = obj_to_colliders(
-                        uid=uid,
-                        object_out_dir=asset_out_dir,
-                        max_colliders=max_colliders,
-                        capture_stdout=(not live),
-                        failed_objects=failed_objects,
-                        delete_objs=delete_objs,
-                        **{
-                            "timeout": 60,
-                            **extra_collider_kwargs,
-                        },
-                    )
-                assert success == (uid not in failed_objects)
-
-            if success and (not skip_conversion) and (not skip_colliders):
-                with Timer(
-                    f"{log_prefix}Saving {asset_out_dir} {uid} with extension {extension}"
-                ):
-                    # Save to desired format, compression step
-                    save_path = get_extension_save_path(
-                        out_dir=asset_out_dir, asset_id=uid, extension=extension
-                    )
-                    save_thor_asset_file(
-                        asset_json=add_default_annotations(
-                            load_existing_thor_asset_file(
-                                out_dir=asset_out_dir, object_name=uid
-                            ),
-                            asset_directory=asset_out_dir,
-                        ),
-                        save_path=save_path,
-                    )
-                    if extension != ".json" and not keep_json_asset:
-                        print(f"{log_prefix}Removing .json asset")
-                        try:
-                            json_asset_path = get_existing_thor_asset_file_path(
-                                out_dir=asset_out_dir,
-                                asset_id=uid,
-                                force_extension=".json",
-                            )
-                            os.remove(json_asset_path)
-                        except RuntimeError:
-                            pass
-
-                    # Get size of GLB asset in MB
-                    glb_size = os.path.getsize(glb_path) / (1024 * 1024)
-                    # Get size of optimized asset in MB
-                    asset_size = os.path.getsize(save_path) / (1024 * 1024)
-                    for p in glob.glob(os.path.join(asset_out_dir, "*.jpg")):
-                        asset_size += os.path.getsize(p) / (1024 * 1024)
-
-                    print(
-                        f"{log_prefix}Original asset size {glb_size:.2f} MB,"
-                        f" new asset size {asset_size:.2f}MB ({100 * (1 - asset_size / glb_size):0.2f}% reduction)",
-                        flush=True,
-                    )
+            if failure_info is not None:
+                failed_objects[uid] = failure_info
 
             asset_metadata: Optional[Dict[str, Any]] = None
             if success and not skip_thor_metadata:
-                import ai2thor.controller
-                import ai2thor.fifo_server
-
                 with Timer(f"{log_prefix}THOR Metadata and visualization ({uid})"):
                     if not controller:
-                        controller = ai2thor.controller.Controller(
-                            commit_id=THOR_COMMIT_ID,
-                            fieldOfView=46,
-                            platform=thor_platform,
-                            start_unity=True,
-                            scene="Procedural",
-                            gridSize=0.25,
+                        controller = create_thor_controller(
+                            thor_platform=thor_platform,
                             width=width,
                             height=height,
-                            server_class=ai2thor.fifo_server.FifoServer,
-                            antiAliasing=None if skip_thor_render else "fxaa",
-                            quality="Very Low" if skip_thor_render else "Ultra",
-                            makeAgentsVisible=False,
+                            skip_thor_render=skip_thor_render,
                         )
 
                     controller.initialization_parameters["makeAgentsVisible"] = False
@@ -644,13 +1048,14 @@ def optimize_assets_for_thor(
                     f"{log_prefix}Finished Object '{uid}' success: {success}. Object Runtime: {end-start_obj_time:0.2f}s"
                 )
 
-        failed_json_str = json.dumps(failed_objects)
-
-        if report_out_path is not None and len(failed_objects):
-            with open(report_out_path, "a") as f:
-                f.write(failed_json_str)
-
-        print(f"{log_prefix}Failed objects: {failed_json_str}")
+        summary = f"{log_prefix}Failed {len(failed_objects)}/{num_processed} objects"
+        if len(failed_objects):
+            summary += f": {list(failed_objects.keys())}"
+            if report_out_path is not None:
+                with open(report_out_path, "a") as f:
+                    json.dump(failed_objects, f)
+                summary += f", report at {report_out_path}"
+        print(summary)
         end = time.perf_counter()
         print(f"{log_prefix}Total Runtime: {end-start_process_time:0.2f}s")
 
@@ -777,7 +1182,26 @@ def main(args):
     parser.add_argument(
         "--keep_json_asset",
         action="store_true",
-        help="Whether it keeps the intermediate .json asset file when using a non-json `extension`.",
+        help="Whether it keeps the intermediate (json or msgpack) asset file when it differs from the `extension` asset.",
+    )
+
+    parser.add_argument(
+        "--texture_format",
+        type=str,
+        default="png",
+        choices=["png", "jpg"],
+        help="Format blender saves textures in. With jpg, blender writes the albedo, normal, and emission"
+        " textures as jpgs directly, skipping the (slower) SSIM-based jpg compression step.",
+    )
+
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="Number of processes used for the blender conversion and collider generation steps,"
+        " these are split evenly between the two steps so that they can run concurrently. By default"
+        " assets are processed serially, note that each blender process is itself multi-threaded and"
+        " can use several GB of memory.",
     )
 
     found_blender = False
@@ -834,9 +1258,7 @@ def main(args):
         ), "If uids and glb_paths are specified, then they must be the same length."
         uid_to_glb_path = {uid: glb_path for uid, glb_path in zip(uids, glb_paths)}
     elif uids is not None:
-        uid_to_glb_path = objaverse.load_objects(
-            uids=uids, download_processes=multiprocessing.cpu_count()
-        )
+        uid_to_glb_path = download_objaverse_glbs(uids)
     elif glb_paths is not None:
         uid_to_glb_path = {
             os.path.splitext(os.path.basename(glb_path))[0]: glb_path
@@ -845,30 +1267,46 @@ def main(args):
     else:
         raise ValueError("Must specify either `uids` or `glb_paths`.")
 
-    # noinspection PyTestUnpassedFixture
-    optimize_assets_for_thor(
-        output_dir=args.output_dir,
-        uid_to_glb_path=uid_to_glb_path,
-        annotations_path=args.annotations,
-        max_colliders=args.max_colliders,
-        skip_conversion=args.skip_conversion,
-        skip_colliders=args.skip_colliders,
-        skip_thor_metadata=args.skip_thor_metadata,
-        skip_thor_render=args.skip_thor_render,
-        blender_as_module=args.blender_as_module,
-        extension=args.extension,
-        thor_platform=args.thor_platform,
-        blender_installation_path=args.blender_installation_path,
-        live=args.live,
-        absolute_texture_paths=args.absolute_texture_paths,
-        delete_objs=args.delete_objs,
-        keep_json_asset=args.keep_json_asset,
-        width=args.width,
-        height=args.height,
-        skybox_color=tuple(map(int, args.skybox_color.split(","))),
-        send_asset_to_controller=args.send_asset_to_controller,
-        add_visualize_thor_actions=args.add_visualize_thor_actions,
-    )
+    controller = None
+    if not args.skip_thor_metadata:
+        controller = create_thor_controller(
+            thor_platform=args.thor_platform,
+            width=args.width,
+            height=args.height,
+            skip_thor_render=args.skip_thor_render,
+        )
+
+    try:
+        # noinspection PyTestUnpassedFixture
+        optimize_assets_for_thor(
+            output_dir=args.output_dir,
+            uid_to_glb_path=uid_to_glb_path,
+            annotations_path=args.annotations,
+            max_colliders=args.max_colliders,
+            skip_conversion=args.skip_conversion,
+            skip_colliders=args.skip_colliders,
+            skip_thor_metadata=args.skip_thor_metadata,
+            skip_thor_render=args.skip_thor_render,
+            blender_as_module=args.blender_as_module,
+            extension=args.extension,
+            thor_platform=args.thor_platform,
+            blender_installation_path=args.blender_installation_path,
+            live=args.live,
+            absolute_texture_paths=args.absolute_texture_paths,
+            delete_objs=args.delete_objs,
+            keep_json_asset=args.keep_json_asset,
+            width=args.width,
+            height=args.height,
+            skybox_color=tuple(map(int, args.skybox_color.split(","))),
+            send_asset_to_controller=args.send_asset_to_controller,
+            add_visualize_thor_actions=args.add_visualize_thor_actions,
+            num_workers=args.num_workers,
+            texture_format=args.texture_format,
+            controller=controller,
+        )
+    finally:
+        if controller is not None:
+            controller.stop()
 
 
 if __name__ == "__main__":
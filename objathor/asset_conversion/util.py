@@ -5,9 +5,10 @@ import os
 import pathlib
 import shutil
 from collections import OrderedDict
-from io import BytesIO
+from functools import lru_cache
+from io import BufferedReader, BytesIO, FileIO
 from sys import platform
-from typing import Tuple
+from typing import TYPE_CHECKING, Any, Optional, Tuple
 
 import numpy as np
 
@@ -15,6 +16,9 @@ from objathor.asset_conversion.asset_conversion_constants import (
     EMPTY_HOUSE_JSON_PATH,
 )  # DO NOT CHANGE THIS IMPORT, talk to Luca if something is broken for you
 
+if TYPE_CHECKING:
+    import PIL.Image
+
 logger = logging.getLogger(__name__)
 
 EXTENSIONS_LOADABLE_IN_UNITY = {
@@ -25,6 +29,74 @@ EXTENSIONS_LOADABLE_IN_UNITY = {
 }
 
 
+@lru_cache(maxsize=None)
+def _get_turbo_jpeg() -> Optional[Any]:
+    """
+    Returns a (process wide) TurboJPEG handle if PyTurboJPEG and libjpeg-turbo are installed, otherwise None
+    in which case we fall back to encoding/decoding JPEGs with PIL.
+    """
+    try:
+        from turbojpeg import TurboJPEG
+
+        return TurboJPEG()
+    except (ImportError, RuntimeError, OSError):
+        return None
+
+
+def encode_jpeg(img: np.ndarray, quality: int) -> bytes:
+    """
+    Encodes an HxWx3 uint8 RGB image as a JPEG, using libjpeg-turbo when available.
+    """
+    turbo_jpeg = _get_turbo_jpeg()
+    if turbo_jpeg is not None:
+        from turbojpeg import TJPF_RGB, TJSAMP_420
+
+        # 4:2:0 chroma subsampling and the (default) accurate DCT match PIL's defaults so that the
+        # output doesn't depend on which backend is installed
+        return turbo_jpeg.encode(
+            np.ascontiguousarray(img),
+            quality=quality,
+            pixel_format=TJPF_RGB,
+            jpeg_subsample=TJSAMP_420,
+        )
+
+    from PIL import Image
+
+    with BytesIO() as f:
+        Image.fromarray(img).save(f, "JPEG", quality=quality)
+        return f.getvalue()
+
+
+def decode_jpeg(jpg: bytes) -> np.ndarray:
+    """
+    Decodes JPEG bytes into an HxWx3 uint8 RGB image, using libjpeg-turbo when available.
+    """
+    turbo_jpeg = _get_turbo_jpeg()
+    if turbo_jpeg is not None:
+        from turbojpeg import TJPF_RGB
+
+        return turbo_jpeg.decode(jpg, pixel_format=TJPF_RGB)
+
+    from PIL import Image
+
+    with BytesIO(jpg) as f:
+        return np.array(Image.open(f).convert("RGB"))
+
+
+def load_image(path: str) -> "PIL.Image.Image":
+    """
+    Opens and fully decodes the image at `path`. Reads go through a 1MiB buffer (much larger than
+    the default) which substantially speeds up decoding large PNG textures. The file is closed
+    before returning.
+    """
+    from PIL import Image
+
+    with BufferedReader(FileIO(path, "rb"), buffer_size=1 << 20) as f:
+        img = Image.open(f)
+        img.load()
+    return img
+
+
 def compress_image_to_ssim_threshold(
     input_path: str,
     output_path: str,
@@ -71,9 +143,9 @@ def compress_image_to_ssim_threshold(
 
     # Load the image inside the function
     if input_path.lower().endswith(".jpg"):
-        original_img = Image.open(input_path).convert("RGB")
+        original_img = load_image(input_path).convert("RGB")
     else:
-        original_img_rgba = Image.open(input_path)
+        original_img_rgba = load_image(input_path)
         original_img_rgba_on_white = Image.new("RGBA", original_img_rgba.size, "WHITE")
         original_img_rgba_on_white.paste(original_img_rgba, (0, 0), original_img_rgba)
         original_img = original_img_rgba_on_white.convert("RGB")
@@ -85,21 +157,23 @@ def compress_image_to_ssim_threshold(
     # If we can't find a quality level that meets the threshold, we save at
     # 95 quality, not 100 because we never want to save at 100% quality regardless of what SSIM says (too big)
     best_quality = max_quality
+    best_jpg = None
     while left <= right:
         mid = (left + right) // 2
-        with BytesIO() as f:
-            original_img.save(f, "JPEG", quality=mid)
-            f.seek(0)
-            compressed_img = Image.open(f).convert("RGB")
-            compressed_img_np = np.array(compressed_img)
+        jpg = encode_jpeg(original_img_np, quality=mid)
+        compressed_img_np = decode_jpeg(jpg)
         s = ssim(original_img_np, compressed_img_np, channel_axis=2)
         if s >= threshold:
             best_quality = mid
+            best_jpg = jpg
             right = mid - 1
         else:
             left = mid + 1
     # Save the image with the best quality found
-    original_img.save(output_path, "JPEG", quality=best_quality)
+    if best_jpg is None:
+        best_jpg = encode_jpeg(original_img_np, quality=best_quality)
+    with open(output_path, "wb") as f:
+        f.write(best_jpg)
     # Return the quality level and the SSIM
     return best_quality, s
 
@@ -1,5 +1,7 @@
 import time
-from typing import List, Any, Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import List, Any, Callable, Iterator, Sequence, Tuple
 
 import openai
 from tqdm import tqdm
@@ -53,6 +55,63 @@ def num_tokens_from_string(string: str, encoding_name: str = "cl100k_base") -> i
     return num_tokens
 
 
+def get_embeddings_batch(
+    texts: Sequence[str],
+    model: str = DEFAULT_EMBED,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> List[List[float]]:
+    """Embeds all `texts` with a single request to the embeddings endpoint."""
+
+    def embedding_create() -> List[List[float]]:
+        return [
+            d.embedding
+            for d in client()
+            .embeddings.create(
+                input=[text.replace("\n", " ") for text in texts],
+                model=model,
+            )
+            .data
+        ]
+
+    return access_gpt_with_retries(func=embedding_create, max_attempts=max_attempts)
+
+
+def get_embeddings_batches_concurrently(
+    text_batches: Sequence[Sequence[str]],
+    model: str = DEFAULT_EMBED,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    num_workers: int = 8,
+) -> Iterator[Tuple[int, List[List[float]]]]:
+    """
+    Embeds every batch in `text_batches` using `num_workers` concurrent requests, yielding
+    `(batch_index, embeddings)` pairs in the order the requests complete. At most
+    `2 * num_workers` batches are submitted at any time.
+    """
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        batch_inds = iter(range(len(text_batches)))
+        pending = {}
+        try:
+            while True:
+                for batch_ind in islice(batch_inds, 2 * num_workers - len(pending)):
+                    future = executor.submit(
+                        get_embeddings_batch,
+                        text_batches[batch_ind],
+                        model=model,
+                        max_attempts=max_attempts,
+                    )
+                    pending[future] = batch_ind
+
+                if len(pending) == 0:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 def get_embeddings_from_texts(
     texts: Sequence[str],
     model: str = DEFAULT_EMBED,
@@ -61,21 +120,10 @@ def get_embeddings_from_texts(
 ) -> List[List[float]]:
     embs = []
     for i in tqdm(list(range(0, len(texts), chunk_size))):
-        chunk = texts[i : i + chunk_size]
-
-        def embedding_create() -> List[List[float]]:
-            return [
-                d.embedding
-                for d in client()
-                .embeddings.create(
-                    input=[text.replace("\n", " ") for text in chunk],
-                    model=model,
-                )
-                .data
-            ]
-
         embs.extend(
-            access_gpt_with_retries(func=embedding_create, max_attempts=max_attempts)
+            get_embeddings_batch(
+                texts[i : i + chunk_size], model=model, max_attempts=max_attempts
+            )
         )
 
     return embs
@@ -1,4 +1,5 @@
-from typing import List, Optional, Sequence
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 
 
 def _ensure_nltk():
@@ -39,18 +40,13 @@ def _gather_synsets(current_synset_str: str) -> List[str]:
     return res
 
 
-_ALL_SYNSETS = {}
+@lru_cache(maxsize=None)
+def _all_synsets(top_synset_str: str) -> Tuple[str, ...]:
+    return tuple(sorted(set(_gather_synsets(top_synset_str))))
 
 
-def all_synsets(top_synset_str: Optional[str] = None) -> List[str]:
-    top_synset_str = top_synset_str or DEFAULT_TOP_SYNSET_STR
-
-    global _ALL_SYNSETS
-    if _ALL_SYNSETS.get(top_synset_str, None) is None:
-        _ALL_SYNSETS[top_synset_str] = sorted(
-            list(set(_gather_synsets(top_synset_str)))
-        )
-    return _ALL_SYNSETS[top_synset_str]
+def all_synsets(top_synset_str: Optional[str] = None) -> Tuple[str, ...]:
+    return _all_synsets(top_synset_str or DEFAULT_TOP_SYNSET_STR)
 
 
 def synset_definitions(synset_strs: Sequence[str]):
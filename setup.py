@@ -20,6 +20,7 @@ if __name__ == "__main__":
 
     REQUIREMENTS = _read_reqs("requirements.txt")
     REQUIREMENTS_ANNOTATION = _read_reqs("requirements-annotation.txt")
+    REQUIREMENTS_SPEEDUPS = _read_reqs("requirements-speedups.txt")
 
     setup(
         name="objathor",
@@ -38,6 +39,7 @@ if __name__ == "__main__":
         install_requires=REQUIREMENTS,
         extras_require={
             "annotation": REQUIREMENTS_ANNOTATION,
+            "speedups": REQUIREMENTS_SPEEDUPS,
         },
         classifiers=[
             "Development Status :: 4 - Beta",
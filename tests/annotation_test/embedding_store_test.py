@@ -0,0 +1,234 @@
+import types
+import zlib
+
+import numpy as np
+import pytest
+
+esd = pytest.importorskip("objathor.annotation.embed_synset_definitions")
+compress_pickle = pytest.importorskip("compress_pickle")
+
+EmbeddingStore = esd.EmbeddingStore
+
+SYNSETS = [f"thing{i}.n.01" for i in range(10)] + ["run.v.01"]
+
+
+def _fake_embedding(text, dim=8):
+    return np.random.default_rng(zlib.crc32(text.encode())).normal(size=dim)
+
+
+def _fake_synset(synset_str):
+    name = synset_str.split(".")[0]
+    lemma = types.SimpleNamespace(name=lambda: name)
+    return types.SimpleNamespace(
+        name=lambda: synset_str,
+        lemmas=lambda: [lemma],
+        definition=lambda: f"the definition of {name}",
+    )
+
+
+class FakeEmbedder:
+    def __init__(self, fail_on_batch=None):
+        self.fail_on_batch = fail_on_batch
+        self.embedded = []
+
+    def __call__(self, text_batches):
+        for batch_ind, batch in enumerate(text_batches):
+            if batch_ind == self.fail_on_batch:
+                raise RuntimeError("Interrupted")
+            self.embedded.extend(batch)
+            yield batch_ind, [_fake_embedding(text) for text in batch]
+
+
+@pytest.fixture
+def fake_wordnet(monkeypatch):
+    monkeypatch.setattr(esd, "all_synsets", lambda: SYNSETS)
+    monkeypatch.setattr(esd, "wn", types.SimpleNamespace(synset=_fake_synset))
+    monkeypatch.setattr(esd, "EMBEDDING_BATCH_SIZE", 3)
+
+
+def _random_store(num_keys=5, dim=8, texts=True):
+    keys = [f"key{i}" for i in range(num_keys)]
+    embs = esd._normalized_rows(np.random.default_rng(0).normal(size=(num_keys, dim)))
+    return EmbeddingStore(
+        key_list=keys,
+        embs=embs,
+        texts=[f"text {key}" for key in keys] if texts else None,
+    )
+
+
+def test_save_load_round_trip(tmp_path):
+    store = _random_store()
+    base = str(tmp_path / "store")
+    assert not EmbeddingStore.exists(base)
+
+    store.save(base)
+    assert EmbeddingStore.exists(base)
+
+    loaded = EmbeddingStore.load(base)
+    assert loaded.key_list == store.key_list
+    assert loaded.texts == store.texts
+    assert loaded.embs.dtype == esd.EMBEDDING_DISK_DTYPE
+    np.testing.assert_allclose(loaded.matrix, store.matrix, atol=1e-3)
+    assert loaded["key3"].dtype == np.float32
+    np.testing.assert_allclose(loaded["key3"], store["key3"], atol=1e-3)
+
+    as_dict = loaded.to_dict()
+    assert all(type(emb) is np.ndarray for emb in as_dict.values())
+    assert all(emb.dtype == np.float32 for emb in as_dict.values())
+
+
+def test_extend_grows_and_ignores_spare_capacity(tmp_path):
+    store = EmbeddingStore(texts=[])
+    rows = esd._normalized_rows(np.random.default_rng(0).normal(size=(2000, 4)))
+    keys = [f"key{i}" for i in range(len(rows))]
+    for start in range(0, len(rows), 700):
+        store.extend(
+            keys[start : start + 700],
+            rows[start : start + 700],
+            texts=keys[start : start + 700],
+        )
+
+    assert len(store) == len(rows)
+    assert store.embs.shape[0] >= len(rows)
+    np.testing.assert_array_equal(store.matrix, rows)
+    np.testing.assert_array_equal(store.rows(["key1999", "key0"]), rows[[1999, 0]])
+
+    base = str(tmp_path / "store")
+    store.save(base)
+    loaded = EmbeddingStore.load(base)
+    assert loaded.embs.shape == rows.shape
+    assert loaded.texts == keys
+
+
+def test_mapping_api():
+    store = _random_store(texts=False)
+    assert list(store) == store.key_list
+    assert list(store.keys()) == store.key_list
+    assert "key1" in store and "missing" not in store
+    assert store.get("missing") is None
+    for key, emb in store.items():
+        np.testing.assert_array_equal(emb, store.matrix[store.key_to_idx[key]])
+
+    as_dict = dict(store)
+    assert list(as_dict.keys()) == store.key_list
+    round_tripped = EmbeddingStore.from_dict(store.to_dict())
+    assert round_tripped.key_list == store.key_list
+    np.testing.assert_array_equal(round_tripped.matrix, store.matrix)
+
+
+def test_get_embeddings_resumes_after_interruption(tmp_path, monkeypatch, fake_wordnet):
+    fname = str(tmp_path / "definition_embeddings")
+    nouns = [s for s in SYNSETS if ".n." in s]
+
+    interrupted = FakeEmbedder(fail_on_batch=2)
+    monkeypatch.setattr(esd, "get_embeddings_batches_concurrently", interrupted)
+    with pytest.raises(RuntimeError):
+        esd.get_embeddings(fname)
+
+    # The batches embedded before the interruption were saved
+    partial = EmbeddingStore.load(fname)
+    assert partial.key_list == nouns[:6]
+
+    resumed = FakeEmbedder()
+    monkeypatch.setattr(esd, "get_embeddings_batches_concurrently", resumed)
+    data = esd.get_embeddings(fname)
+
+    assert len(resumed.embedded) == len(nouns) - 6
+    assert data.key_list == nouns
+    assert EmbeddingStore.load(fname).key_list == nouns
+    for synset_str, text in zip(nouns, interrupted.embedded + resumed.embedded):
+        expected = _fake_embedding(text)
+        np.testing.assert_allclose(
+            data[synset_str], expected / np.linalg.norm(expected), atol=1e-3
+        )
+
+
+def test_get_embeddings_converts_legacy_pickle(tmp_path, monkeypatch, fake_wordnet):
+    fname = str(tmp_path / "definition_embeddings")
+    legacy = _random_store(num_keys=4, texts=False)
+    legacy_dict = dict(zip(SYNSETS[:4], legacy.matrix))
+    compress_pickle.dump(legacy_dict, f"{fname}.pkl.gz")
+
+    embedder = FakeEmbedder()
+    monkeypatch.setattr(esd, "get_embeddings_batches_concurrently", embedder)
+    data = esd.get_embeddings(fname)
+
+    # Only the synsets missing from the legacy file are embedded
+    assert len(embedder.embedded) == len(SYNSETS) - 1 - 4
+    assert EmbeddingStore.exists(fname)
+    for synset_str, emb in legacy_dict.items():
+        np.testing.assert_allclose(data[synset_str], emb, atol=1e-3)
+
+
+@pytest.fixture
+def fake_lemmas(monkeypatch):
+    monkeypatch.setattr(esd, "all_synsets", lambda: SYNSETS)
+    monkeypatch.setattr(
+        esd, "synset_definitions", lambda synsets: [f"def of {s}" for s in synsets]
+    )
+    monkeypatch.setattr(esd, "_lemmas_of", lambda s: [s.split(".")[0]])
+    monkeypatch.setattr(esd, "_hypers_of", lambda s: [])
+    monkeypatch.setattr(esd, "_hypos_of", lambda s: [])
+    monkeypatch.setattr(esd, "EMBEDDING_BATCH_SIZE", 3)
+
+
+def test_lemmas_embeddings_resume_after_interruption(
+    tmp_path, monkeypatch, fake_lemmas
+):
+    fname = str(tmp_path / "lemmas_embeddings")
+
+    interrupted = FakeEmbedder(fail_on_batch=2)
+    monkeypatch.setattr(esd, "get_embeddings_batches_concurrently", interrupted)
+    with pytest.raises(RuntimeError):
+        esd.get_lemmas_definition_embeddings(fname)
+
+    resumed = FakeEmbedder()
+    monkeypatch.setattr(esd, "get_embeddings_batches_concurrently", resumed)
+    data = esd.get_lemmas_definition_embeddings(fname)
+
+    assert len(interrupted.embedded) == 6
+    assert len(resumed.embedded) == len(SYNSETS) - 6
+    assert data.key_list == SYNSETS
+    assert data.texts == interrupted.embedded + resumed.embedded
+    for synset_str, text in zip(data.key_list, data.texts):
+        expected = _fake_embedding(text)
+        np.testing.assert_allclose(
+            data[synset_str], expected / np.linalg.norm(expected), atol=1e-3
+        )
+
+
+def test_lemmas_embeddings_check_saved_rows(tmp_path, monkeypatch, fake_lemmas):
+    fname = str(tmp_path / "lemmas_embeddings")
+    monkeypatch.setattr(esd, "get_embeddings_batches_concurrently", FakeEmbedder())
+    esd.get_lemmas_definition_embeddings(fname)
+
+    monkeypatch.setattr(esd, "all_synsets", lambda: SYNSETS[::-1])
+    with pytest.raises(AssertionError, match="different keys"):
+        esd.get_lemmas_definition_embeddings(fname)
+
+    monkeypatch.setattr(esd, "all_synsets", lambda: SYNSETS)
+    with open(f"{fname}.embs.f16", "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(AssertionError, match="whole number"):
+        esd.get_lemmas_definition_embeddings(fname)
+
+
+def test_lemmas_embeddings_convert_legacy_pickle(tmp_path, monkeypatch, fake_lemmas):
+    fname = str(tmp_path / "lemmas_embeddings")
+    legacy = _random_store(num_keys=4)
+    compress_pickle.dump(
+        {
+            synset_str: dict(emb=emb, text=text)
+            for synset_str, emb, text in zip(SYNSETS, legacy.matrix, legacy.texts)
+        },
+        f"{fname}.pkl.gz",
+    )
+
+    embedder = FakeEmbedder()
+    monkeypatch.setattr(esd, "get_embeddings_batches_concurrently", embedder)
+    data = esd.get_lemmas_definition_embeddings(fname)
+
+    assert len(embedder.embedded) == len(SYNSETS) - 4
+    assert data.key_list == SYNSETS
+    assert data.texts[:4] == legacy.texts
+    np.testing.assert_allclose(data.matrix[:4], legacy.matrix, atol=1e-3)
@@ -0,0 +1,235 @@
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+pipeline_to_thor = pytest.importorskip("objathor.asset_conversion.pipeline_to_thor")
+
+UIDS = [f"uid{i}" for i in range(20)]
+
+
+def _convert(uid, glb_path):
+    assert glb_path == f"{uid}.glb"
+    if uid == "uid3":
+        return uid, False, dict(blender_process_return_fail=True)
+    if uid == "uid7":
+        raise RuntimeError(f"Crashed converting {uid}")
+    return uid, True, None
+
+
+def _colliders(uid, glb_path):
+    assert glb_path == f"{uid}.glb"
+    if uid == "uid5":
+        return uid, False, dict(failed_generate_colliders=True)
+    return uid, True, None
+
+
+def _raising_colliders(uid, glb_path):
+    raise RuntimeError(f"Crashed generating colliders for {uid}")
+
+
+def _run(uids, num_workers, convert=_convert, colliders=_colliders):
+    return pipeline_to_thor._run_conversion_stages(
+        uid_glb_paths=((uid, f"{uid}.glb") for uid in uids),
+        convert_glb=convert,
+        generate_colliders_and_save=colliders,
+        num_workers=num_workers,
+    )
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 8])
+def test_conversion_stages_results(num_workers):
+    uids = [uid for uid in UIDS if uid != "uid7"]
+    results = list(_run(uids, num_workers))
+
+    if num_workers == 1:
+        assert [uid for uid, _, _ in results] == uids
+    assert len(results) == len(uids)
+    results = {uid: (success, failure_info) for uid, success, failure_info in results}
+    assert set(results) == set(uids)
+    assert results["uid3"] == (False, dict(blender_process_return_fail=True))
+    assert results["uid5"] == (False, dict(failed_generate_colliders=True))
+    assert all(
+        results[uid] == (True, None) for uid in uids if uid not in ("uid3", "uid5")
+    )
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 8])
+def test_conversion_stages_propagate_exceptions(num_workers):
+    with pytest.raises(RuntimeError, match="Crashed converting uid7"):
+        list(_run(UIDS, num_workers))
+
+    with pytest.raises(RuntimeError, match="Crashed generating colliders"):
+        list(_run(UIDS[:2], num_workers, colliders=_raising_colliders))
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 8])
+def test_conversion_stages_repeated_uids(num_workers):
+    uids = ["uid1", "uid1", "uid2", "uid3", "uid1", "uid3"]
+    results = list(_run(uids, num_workers))
+    assert sorted(uid for uid, _, _ in results) == sorted(uids)
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 8])
+def test_conversion_stages_consume_input_lazily(num_workers):
+    uids = [uid for uid in UIDS if uid != "uid7"]
+    consumed = []
+
+    def uid_glb_paths():
+        for uid in uids:
+            consumed.append(uid)
+            yield uid, f"{uid}.glb"
+
+    results = pipeline_to_thor._run_conversion_stages(
+        uid_glb_paths=uid_glb_paths(),
+        convert_glb=_convert,
+        generate_colliders_and_save=_colliders,
+        num_workers=num_workers,
+        max_queued=2,
+    )
+    # At most `stage_workers + max_queued` assets are in flight in each of the two stages
+    max_in_flight = 2 * (max(num_workers // 2, 1) + 2) if num_workers > 1 else 1
+    num_results = 0
+    for _ in results:
+        num_results += 1
+        assert len(consumed) - num_results <= max_in_flight
+    assert num_results == len(uids)
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_stream_output_finds_progress_split_across_reads():
+    return_code, output, progress_complete = pipeline_to_thor._run_and_stream_output(
+        _python(
+            "import os, time\n"
+            "os.write(1, b'Progress: 50.00%\\nProgress: 10')\n"
+            "time.sleep(0.2)\n"
+            "os.write(1, b'0.00%\\n')\n"
+            "os.write(2, b'done')\n"
+        )
+    )
+    assert return_code == 0
+    assert progress_complete
+    assert output == "Progress: 50.00%\nProgress: 100.00%\ndone"
+
+
+def test_stream_output_without_progress():
+    return_code, output, progress_complete = pipeline_to_thor._run_and_stream_output(
+        _python("import sys; print('Progress: 10.00%'); sys.exit(3)")
+    )
+    assert return_code == 3
+    assert not progress_complete
+    assert output.strip() == "Progress: 10.00%"
+
+
+def test_stream_output_keeps_only_the_tail():
+    _, output, _ = pipeline_to_thor._run_and_stream_output(
+        _python(
+            "import os\n"
+            "for i in range(64):\n"
+            "    os.write(1, str(i).encode() * 100000)\n"
+            "os.write(1, b'END')\n"
+        ),
+        max_output_chunks=2,
+    )
+    assert output.endswith("63" * 1000 + "END")
+    assert len(output) <= 2 * (1 << 16)
+
+
+def test_stream_output_timeout():
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        pipeline_to_thor._run_and_stream_output(
+            _python("import time; print('started', flush=True); time.sleep(30)"),
+            timeout=0.5,
+        )
+    assert time.monotonic() - start < 10
+
+
+def _rotated_box_vertices(deg, num_points=500, seed=0):
+    # Points in a (2, 1, 0.5) box rotated by `deg` degrees around the y axis
+    points = np.random.default_rng(seed).uniform(-0.5, 0.5, (num_points, 3))
+    points *= (2.0, 1.0, 0.5)
+    theta = np.deg2rad(deg)
+    rotmat = np.array(
+        [
+            [np.cos(theta), 0, -np.sin(theta)],
+            [0, 1, 0],
+            [np.sin(theta), 0, np.cos(theta)],
+        ]
+    )
+    return (points @ rotmat.T).astype(np.float32)
+
+
+@pytest.mark.parametrize("deg", [-30, 0, 12])
+def test_min_bounding_box_rotation(deg):
+    rotation = pipeline_to_thor.compute_thor_rotation_to_obtain_min_bounding_box(
+        _rotated_box_vertices(deg), max_deg_change=45, increments=91
+    )
+    assert rotation == pytest.approx(deg, abs=1)
+
+
+def test_min_bounding_box_rotation_vertex_formats():
+    compute = pipeline_to_thor.compute_thor_rotation_to_obtain_min_bounding_box
+    vertices = _rotated_box_vertices(17)
+    vertex_dicts = [dict(x=float(x), y=float(y), z=float(z)) for x, y, z in vertices]
+
+    expected = compute(vertices, max_deg_change=45, increments=91)
+    assert compute(vertex_dicts, max_deg_change=45, increments=91) == expected
+    assert compute(vertices.tobytes(), max_deg_change=45, increments=91) == expected
+    assert compute(vertices.ravel(), max_deg_change=45, increments=91) == expected
+    assert (
+        compute(vertices.astype(np.float64), max_deg_change=45, increments=91)
+        == expected
+    )
+
+
+@pytest.mark.skipif(
+    pipeline_to_thor._y_rotation_bbox_volumes is None, reason="numba not installed"
+)
+def test_min_bounding_box_rotation_numba_matches_numpy(monkeypatch):
+    compute = pipeline_to_thor.compute_thor_rotation_to_obtain_min_bounding_box
+    rng = np.random.default_rng(0)
+    meshes = [
+        _rotated_box_vertices(deg, seed=i) for i, deg in enumerate(range(-40, 41, 7))
+    ]
+    meshes += [
+        (rng.normal(size=(rng.integers(1, 2000), 3)) * rng.uniform(0.2, 3, 3))
+        for _ in range(20)
+    ]
+
+    with_numba = [compute(mesh, max_deg_change=45, increments=91) for mesh in meshes]
+    with pytest.raises(ValueError):
+        compute(np.empty((0, 3)), max_deg_change=45, increments=91)
+
+    monkeypatch.setattr(pipeline_to_thor, "_y_rotation_bbox_volumes", None)
+    with_numpy = [compute(mesh, max_deg_change=45, increments=91) for mesh in meshes]
+    with pytest.raises(ValueError):
+        compute(np.empty((0, 3)), max_deg_change=45, increments=91)
+
+    assert with_numba == with_numpy
+
+
+def test_download_objaverse_glbs_skips_duplicates_and_unknown_uids(
+    tmp_path, monkeypatch
+):
+    objaverse = pipeline_to_thor.objaverse
+    object_paths = {uid: f"glbs/000-000/{uid}.glb" for uid in ("a", "b")}
+    monkeypatch.setattr(objaverse, "_load_object_paths", lambda: object_paths)
+    monkeypatch.setattr(objaverse, "_VERSIONED_PATH", str(tmp_path))
+    (tmp_path / "glbs" / "000-000").mkdir(parents=True)
+    for path in object_paths.values():
+        (tmp_path / path).touch()
+
+    with pytest.warns(UserWarning, match="uid c"):
+        uid_glb_paths = list(
+            pipeline_to_thor.download_objaverse_glbs(["a", "a.glb", "b", "c", "a"])
+        )
+    assert uid_glb_paths == [
+        ("a", str(tmp_path / object_paths["a"])),
+        ("b", str(tmp_path / object_paths["b"])),
+    ]